@@ -0,0 +1,227 @@
+"""End-to-end load benchmark of the fact-check pipelines, with no network access.
+
+Drives one scenario at a target request rate and reports throughput, latency
+percentiles and peak memory. The load is open loop: request i is sent at
+start + i / rps whether or not earlier requests have finished, and its
+latency is measured from that scheduled time, so a saturated server shows up
+as growing latency instead of a silently lower request rate.
+
+External services are replaced by benchmarks.offline (Gemini SDK, google.genai,
+Groq, NewsAPI, Firestore) and benchmarks.fixture_server (Serper, Gemini REST,
+article pages), which is started in-process unless --fixture points at one
+already running.
+
+Scenarios:
+    fc-text     POST /get-fc-text          (input_router, "fast" evidence)
+    fc-url      POST /get-fc-url           (input_router, fixture article URLs)
+    fc-news     POST /fact-check-selected-news
+    extension   POST /api/fact-check       (extension backend, perform_fact_check)
+    news-job    NewsFetcher.aprocess_single_news
+    scam-job    ScamFetcher.fetch_latest_scams
+
+Usage (from backend_matrix/):
+    python -m benchmarks.bench_load --scenario fc-text --rps 10 --duration 30
+    python -m benchmarks.bench_load --scenario extension --rps 50 --latency-ms 300 --error-rate 0.01
+    python -m benchmarks.bench_load --scenario fc-url --rps 5 --distinct 20 --json results.json
+"""
+import argparse
+import asyncio
+import collections
+import importlib.util
+import json
+import math
+import os
+import resource
+import sys
+import time
+
+from benchmarks import offline
+from benchmarks.fixture_server import FixtureServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXTENSION_MAIN = os.path.join(os.path.dirname(BACKEND_DIR), "frontend_extension_matrix", "backend", "main.py")
+
+SCENARIOS = ("fc-text", "fc-url", "fc-news", "extension", "news-job", "scam-job")
+
+
+def claim_text(i: int) -> str:
+    return f"Claim {i}: " + " ".join(offline.fake_sentence("claim", i, j) for j in range(3))
+
+
+def _http_outcome(response) -> str:
+    """'ok', or the error class of a route response"""
+    if response.status_code >= 400:
+        return f"http_{response.status_code}"
+    try:
+        body = response.json()
+    except ValueError:
+        return "invalid_json"
+    if isinstance(body, dict) and body.get("status") == "error":
+        return "status_error"
+    return "ok"
+
+
+def _asgi_client(app):
+    import httpx
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None)
+
+
+def build_scenario(name: str, distinct: int):
+    """Return (send(i) -> outcome coroutine function, close coroutine function) for a scenario"""
+    key = (lambda i: i % distinct) if distinct else (lambda i: i)
+
+    if name in ("fc-text", "fc-url", "fc-news"):
+        from fastapi import FastAPI
+        from routes.user_inputs import input_router
+
+        app = FastAPI()
+        app.include_router(input_router)
+        client = _asgi_client(app)
+        path, payload = {
+            "fc-text": ("/get-fc-text", lambda i: {"text": claim_text(key(i))}),
+            "fc-url": ("/get-fc-url", lambda i: {"url": offline.page_url(key(i))}),
+            "fc-news": ("/fact-check-selected-news", lambda i: {"news_url": offline.page_url(key(i))}),
+        }[name]
+
+        async def send(i):
+            return _http_outcome(await client.post(path, json=payload(i)))
+        return send, client.aclose
+
+    if name == "extension":
+        spec = importlib.util.spec_from_file_location("extension_backend", EXTENSION_MAIN)
+        extension = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(extension)
+        client = _asgi_client(extension.app)
+
+        async def send(i):
+            page = {"title": f"Article {key(i)}", "content": claim_text(key(i)), "url": offline.page_url(key(i))}
+            return _http_outcome(await client.post("/api/fact-check", json=page))
+        return send, client.aclose
+
+    if name == "news-job":
+        from fc.newsfetcher import NewsFetcher
+        fetcher = NewsFetcher()
+
+        async def send(i):
+            result = await fetcher.aprocess_single_news()
+            return "status_error" if result.get("status") == "error" else "ok"
+    else:
+        from fc.scam_fetcher import ScamFetcher
+        fetcher = ScamFetcher()
+
+        async def send(i):
+            return "ok" if await asyncio.to_thread(fetcher.fetch_latest_scams) else "no_scams"
+
+    async def close():
+        pass
+    return send, close
+
+
+def percentile(ordered, q: float) -> float:
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)] if ordered else float("nan")
+
+
+async def sample_memory(peak: dict, interval: float = 0.05):
+    from core.metrics import resident_memory_bytes
+    while True:
+        peak["rss"] = max(peak["rss"], resident_memory_bytes() or 0)
+        await asyncio.sleep(interval)
+
+
+async def drive(send, rps: float, duration: float):
+    loop = asyncio.get_running_loop()
+    total = max(1, int(rps * duration))
+    latencies = []
+    outcomes = collections.Counter()
+    peak = {"rss": 0}
+    sampler = asyncio.create_task(sample_memory(peak))
+
+    start = loop.time()
+
+    async def one(i):
+        scheduled = start + i / rps
+        await asyncio.sleep(max(0.0, scheduled - loop.time()))
+        try:
+            outcome = await send(i)
+        except Exception as e:
+            outcome = type(e).__name__
+        outcomes[outcome] += 1
+        if outcome == "ok":
+            latencies.append(loop.time() - scheduled)
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = loop.time() - start
+    sampler.cancel()
+    return total, elapsed, sorted(latencies), outcomes, peak["rss"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS, default="fc-text")
+    parser.add_argument("--rps", type=float, default=5.0, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    parser.add_argument("--distinct", type=int, default=0,
+                        help="cycle through this many distinct inputs (0: every request is new, so no cache hits)")
+    parser.add_argument("--latency-ms", type=float, default=None, help="latency of every fake call (FC_FAKE_LATENCY_MS)")
+    parser.add_argument("--jitter-ms", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=None, help="fraction of fake calls that fail")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fixture", default=None, help="URL of a running fixture server instead of an in-process one")
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    args = parser.parse_args()
+
+    behavior = offline.FakeBehavior(args.latency_ms, args.jitter_ms, args.error_rate, args.seed)
+    offline.behavior = behavior
+    server = None
+    if args.fixture is None:
+        server = FixtureServer().start()
+    offline.install(args.fixture or server.url, behavior)
+    sys.path.insert(0, BACKEND_DIR)
+
+    send, close = build_scenario(args.scenario, args.distinct)
+
+    async def run():
+        try:
+            return await drive(send, args.rps, args.duration)
+        finally:
+            await close()
+
+    wall_start = time.perf_counter()
+    total, elapsed, latencies, outcomes, peak_rss = asyncio.run(run())
+    wall = time.perf_counter() - wall_start
+    if server is not None:
+        server.close()
+
+    # ru_maxrss is KiB on Linux
+    peak_rss = max(peak_rss, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+    results = {
+        "scenario": args.scenario,
+        "target_rps": args.rps,
+        "duration_s": args.duration,
+        "fake_latency_ms": behavior.latency_ms,
+        "fake_error_rate": behavior.error_rate,
+        "requests": total,
+        "ok": outcomes.get("ok", 0),
+        "errors": {outcome: count for outcome, count in outcomes.items() if outcome != "ok"},
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(outcomes.get("ok", 0) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            f"p{q}": round(1000 * percentile(latencies, q), 1) for q in (50, 90, 95, 99)
+        } | {"max": round(1000 * latencies[-1], 1) if latencies else float("nan")},
+        "peak_rss_mb": round(peak_rss / 2**20, 1),
+    }
+
+    print(f"scenario:     {results['scenario']} at {args.rps:g} rps for {args.duration:g}s "
+          f"(fake latency {behavior.latency_ms:g} ms, error rate {behavior.error_rate:g})")
+    print(f"requests:     {total} sent, {results['ok']} ok, errors {results['errors'] or 'none'}")
+    print(f"throughput:   {results['throughput_rps']} ok/s over {results['elapsed_s']}s (wall {wall:.1f}s)")
+    print("latency (ms): " + "  ".join(f"{name} {value}" for name, value in results["latency_ms"].items()))
+    print(f"peak RSS:     {results['peak_rss_mb']} MB")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Regression benchmark: Gemini prompt size must stay flat across many reports.
+
+Runs the LLM stages of the fact-check pipeline (verification questions,
+enhanced report, source credibility) N times against a recording stand-in for
+genai.GenerativeModel and reports how many characters each request carried,
+including any chat history the SDK would resend. A shared chat session grows
+linearly; stateless generate_content calls stay flat.
+
+Usage (from backend_matrix/):
+    python -m benchmarks.bench_prompt_growth --reports 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+# Keep the benchmark's caches away from the server's
+os.environ.setdefault("FC_CACHE_DIR", tempfile.mkdtemp(prefix="fc-bench-"))
+
+import google.generativeai as genai
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+def _fake_answer(prompt: str) -> str:
+    if "verify this claim" in prompt:
+        return json.dumps({"questions": ["q1", "q2", "q3"]})
+    if "credibility of these news sources" in prompt:
+        return json.dumps([{
+            "source": "example", "credibility_score": 50, "fact_checking_history": 50,
+            "transparency_score": 50, "expertise_level": 50,
+            "additional_metrics": {"citation_score": 50, "peer_recognition": 50},
+        }])
+    return json.dumps({
+        "overall_analysis": {"truth_score": 50, "reliability_assessment": "", "key_findings": []},
+        "claim_analysis": [],
+    })
+
+
+class RecordingModel:
+    """Records the size of every request instead of calling Gemini"""
+    request_sizes = []
+
+    def __init__(self, model_name=None, generation_config=None, **kwargs):
+        self.model_name = model_name
+
+    def _record(self, contents, history_chars=0):
+        RecordingModel.request_sizes.append(history_chars + len(str(contents)))
+        return _Response(_fake_answer(str(contents)))
+
+    def generate_content(self, contents, **kwargs):
+        return self._record(contents)
+
+    async def generate_content_async(self, contents, **kwargs):
+        return self._record(contents)
+
+    def start_chat(self, history=None):
+        return RecordingChat(self, history or [])
+
+
+class RecordingChat:
+    """A chat resends its whole history with every message"""
+
+    def __init__(self, model, history):
+        self.model = model
+        self.history = list(history)
+
+    def send_message(self, content, **kwargs):
+        history_chars = sum(len(str(turn)) for turn in self.history)
+        response = self.model._record(content, history_chars)
+        self.history += [content, response.text]
+        return response
+
+    async def send_message_async(self, content, **kwargs):
+        return self.send_message(content, **kwargs)
+
+
+async def run(reports: int):
+    genai.GenerativeModel = RecordingModel
+    from fc.fact_checker import FactChecker
+
+    fact_checker = FactChecker(groq_api_key="offline", serper_api_key="offline")
+    per_report = []
+    for i in range(reports):
+        start = len(RecordingModel.request_sizes)
+        claim = f"Benchmark claim number {i} about a recurring news story."
+        await fact_checker.agenerate_verification_questions(claim)
+        await fact_checker._agenerate_enhanced_report(claim, [f"evidence summary {i}"])
+        # A fresh domain each time so the credibility cache does not hide the call
+        await fact_checker.aanalyze_source_credibility([f"https://site{i}.example.com/story"])
+        per_report.append(sum(RecordingModel.request_sizes[start:]))
+    return per_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=1000)
+    parser.add_argument("--max-growth", type=float, default=1.10,
+                        help="fail if the last report's prompts exceed the first's by this factor")
+    args = parser.parse_args()
+
+    per_report = asyncio.run(run(args.reports))
+    first, last, peak = per_report[0], per_report[-1], max(per_report)
+    growth = last / first
+    print(f"reports:               {len(per_report)}")
+    print(f"prompt chars (first):  {first}")
+    print(f"prompt chars (last):   {last}")
+    print(f"prompt chars (peak):   {peak}")
+    print(f"growth last/first:     {growth:.3f}")
+
+    if growth > args.max_growth:
+        print("FAIL: prompt size grows with the number of reports")
+        sys.exit(1)
+    print("OK: prompt size is flat")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmark: HTML-to-text extractors against the bs4 html.parser baseline.
+
+Runs every registered extractor in fc.text_extract over a directory of saved
+pages (*.html / *.htm, e.g. pages saved from the crawler), timing page_text
+and visible_text and checking that each result is identical to the bs4
+output.
+
+Usage (from backend_matrix/):
+    python -m benchmarks.bench_text_extract --corpus path/to/saved_pages --repeat 3
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+from fc import text_extract
+
+
+def load_corpus(corpus_dir: str):
+    paths = sorted(
+        glob.glob(os.path.join(corpus_dir, "**", "*.html"), recursive=True)
+        + glob.glob(os.path.join(corpus_dir, "**", "*.htm"), recursive=True)
+    )
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    return pages
+
+
+def time_extractor(fn, pages, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            fn(html)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="directory of saved HTML pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"No .html/.htm files found under {args.corpus}")
+        sys.exit(1)
+    megabytes = sum(len(html.encode("utf-8")) for html in pages) / 1e6
+    print(f"corpus: {len(pages)} pages, {megabytes:.1f} MB, repeat {args.repeat}\n")
+
+    expected_page = [text_extract.bs4_page_text(html) for html in pages]
+    expected_visible = [text_extract.bs4_visible_text(html) for html in pages]
+
+    names = sorted(text_extract._extractors, key=lambda name: name != "bs4")
+    baseline = {}
+    mismatched = False
+    print(f"{'extractor':<10} {'operation':<13} {'ms/page':>9} {'speedup':>8} {'parity':>9}")
+    for name in names:
+        _, (page_text_fn, visible_text_fn) = text_extract.get_extractor(name)
+        for operation, fn, expected in (
+            ("page_text", page_text_fn, expected_page),
+            ("visible_text", visible_text_fn, expected_visible),
+        ):
+            elapsed = time_extractor(fn, pages, args.repeat)
+            baseline.setdefault(operation, elapsed)
+            same = sum(fn(html) == want for html, want in zip(pages, expected))
+            mismatched |= same != len(pages)
+            print(
+                f"{name:<10} {operation:<13} {1000 * elapsed / (len(pages) * args.repeat):>9.2f} "
+                f"{baseline[operation] / elapsed:>7.1f}x {same:>4}/{len(pages):<4}"
+            )
+
+    if mismatched:
+        print("\nFAIL: an extractor's output differs from bs4 on some pages")
+        sys.exit(1)
+    print("\nOK: every extractor matches bs4")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Local HTTP fixture server standing in for Serper, the Gemini REST API and news pages.
+
+    POST /search                                Serper batch search (a JSON list of {"q": ...})
+    POST /v1beta/models/<model>:generateContent Gemini REST, answered from generationConfig.responseSchema
+    GET  /pages/<n>.html                        a deterministic news article page
+
+Search results link to /pages/<n>.html, drawn from a pool of FIXTURE_PAGES
+pages so that, as in real traffic, different queries share some URLs.
+Latency and error injection follow benchmarks.offline.FakeBehavior; an
+injected error is answered with HTTP 503.
+
+Usage (from backend_matrix/):
+    python -m benchmarks.fixture_server --port 8765 --latency-ms 100 --error-rate 0.01
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from benchmarks import offline
+
+FIXTURE_PAGES = int(os.getenv("FC_FIXTURE_PAGES", 200))
+FIXTURE_PARAGRAPHS = int(os.getenv("FC_FIXTURE_PARAGRAPHS", 12))
+SERPER_RESULTS = 10
+
+_GEMINI_PATH = re.compile(r"^/v1beta/models/([^/:]+):generateContent$")
+_PAGE_PATH = re.compile(r"^/pages/(\d+)\.html$")
+
+
+def article_html(n: int, paragraphs: int = FIXTURE_PARAGRAPHS) -> str:
+    title = offline.fake_sentence("title", n, words=8).rstrip(".")
+    body = "\n".join(f"<p>{offline.fake_sentence('paragraph', n, i, words=40)}</p>" for i in range(paragraphs))
+    return f"""<!DOCTYPE html>
+<html><head><title>{title}</title>
+<meta name="description" content="{offline.fake_sentence('description', n)}">
+<style>body {{ font-family: serif; }} .ad {{ display: none; }}</style>
+<script>window.analytics = {{page: {n}}};</script>
+</head><body>
+<nav><a href="/">Home</a> <a href="/world">World</a> <a href="/politics">Politics</a></nav>
+<article><h1>{title}</h1><p class="byline">By Offline Fixture, January 1, 2024</p>
+{body}
+</article>
+<!-- comments are not visible -->
+<footer>Example News {n % 7}</footer>
+</body></html>
+"""
+
+
+def serper_result(query: str, base_url: str) -> dict:
+    organic = []
+    for i in range(SERPER_RESULTS):
+        n = offline.digest("serper", query, i) % FIXTURE_PAGES
+        organic.append({
+            "title": offline.fake_sentence("title", n, words=8).rstrip("."),
+            "link": f"{base_url}/pages/{n}.html",
+            "snippet": offline.fake_sentence("paragraph", n, 0, words=25),
+            "position": i + 1,
+        })
+    return {"searchParameters": {"q": query, "type": "search", "engine": "google"}, "organic": organic}
+
+
+def gemini_result(request: dict) -> dict:
+    prompt = "\n".join(
+        part.get("text", "") for turn in request.get("contents", []) for part in turn.get("parts", [])
+    )
+    schema = request.get("generationConfig", {}).get("responseSchema")
+    candidate = {
+        "content": {"parts": [{"text": offline.fake_answer(prompt, schema)}], "role": "model"},
+        "finishReason": "STOP",
+        "index": 0,
+    }
+    if request.get("tools"):
+        candidate["groundingMetadata"] = {
+            "searchEntryPoint": {"renderedContent": "<div>offline</div>"},
+            "webSearchQueries": [offline.fake_sentence("query", prompt, words=6)],
+        }
+    return {"candidates": [candidate], "usageMetadata": {"promptTokenCount": len(prompt) // 4}}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str, content_type: str = "application/json"):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _inject(self, service: str) -> bool:
+        """Apply the configured latency; True (after answering 503) if this request should fail"""
+        delay, failed = offline.behavior.draw()
+        time.sleep(delay)
+        if failed:
+            self._send(503, json.dumps({"error": f"Injected {service} failure"}))
+        return failed
+
+    def _base_url(self) -> str:
+        return f"http://{self.headers.get('Host') or '%s:%d' % self.server.server_address[:2]}"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        match = _PAGE_PATH.match(path)
+        if not match:
+            self._send(404, json.dumps({"error": "not found"}))
+            return
+        if self._inject("page"):
+            return
+        self._send(200, article_html(int(match.group(1))), "text/html; charset=utf-8")
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            self._send(400, json.dumps({"error": "invalid JSON"}))
+            return
+
+        if path == "/search":
+            if self._inject("serper"):
+                return
+            queries = request if isinstance(request, list) else [request]
+            results = [serper_result(query.get("q", ""), self._base_url()) for query in queries]
+            self._send(200, json.dumps(results if isinstance(request, list) else results[0]))
+        elif _GEMINI_PATH.match(path):
+            if self._inject("gemini"):
+                return
+            self._send(200, json.dumps(gemini_result(request or {})))
+        else:
+            self._send(404, json.dumps({"error": "not found"}))
+
+
+class FixtureServer:
+    """The fixture server running in a daemon thread
+
+    Args:
+        host: interface to bind.
+        port: 0 picks a free port.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.url = "http://%s:%d" % self.httpd.server_address[:2]
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=None)
+    parser.add_argument("--jitter-ms", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=None)
+    args = parser.parse_args()
+
+    offline.behavior = offline.FakeBehavior(args.latency_ms, args.jitter_ms, args.error_rate)
+    server = FixtureServer(args.host, args.port)
+    print(f"Fixture server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""Deterministic offline stand-ins for the external services of the fact-check pipelines.
+
+install() swaps the SDK clients for local fakes before the app modules are
+imported, so generate_report, NewsFetcher.aprocess_single_news and
+ScamFetcher.fetch_latest_scams run without network access or quota:
+
+    google.generativeai.GenerativeModel   -> FakeGenerativeModel
+    google.genai.Client                   -> FakeGenaiClient
+    groq.Groq                             -> FakeGroq
+    newsapi.newsapi_client.NewsApiClient  -> FakeNewsApiClient
+    firebase (the Firestore client)       -> FakeFirestore, in memory
+
+Serper, the Gemini REST API (extension backend) and the crawled pages are
+served over HTTP by benchmarks.fixture_server; install() points
+FC_SERPER_URL and EXT_GEMINI_BASE_URL at it.
+
+Gemini answers are generated from the model's response schema, so they
+parse like real ones. The same prompt always gets the same answer. Every
+fake call sleeps for the configured latency and fails at the configured
+rate (FC_FAKE_LATENCY_MS, FC_FAKE_JITTER_MS, FC_FAKE_ERROR_RATE, FC_FAKE_SEED).
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+import uuid
+from typing import Any, Dict, List, Optional
+
+FAKE_ARRAY_ITEMS = 3
+
+_WORDS = (
+    "government report minister election economy health study officials police court market climate "
+    "energy budget vaccine data survey agency statement analysts inflation policy research investigation"
+).split()
+
+
+class FakeServiceError(Exception):
+    """Injected failure of a fake external service"""
+
+
+class FakeBehavior:
+    """Latency and error injection shared by the fakes and the fixture server
+
+    Args:
+        latency_ms: mean added latency of every call.
+        jitter_ms: the latency is drawn uniformly from latency_ms +/- jitter_ms.
+        error_rate: fraction of calls that fail.
+        seed: seed of the latency/error draws, for repeatable runs.
+    """
+
+    def __init__(self, latency_ms: float = None, jitter_ms: float = None, error_rate: float = None, seed: int = None):
+        self.latency_ms = float(os.getenv("FC_FAKE_LATENCY_MS", 50)) if latency_ms is None else latency_ms
+        self.jitter_ms = float(os.getenv("FC_FAKE_JITTER_MS", 0)) if jitter_ms is None else jitter_ms
+        self.error_rate = float(os.getenv("FC_FAKE_ERROR_RATE", 0)) if error_rate is None else error_rate
+        self._random = random.Random(int(os.getenv("FC_FAKE_SEED", 0)) if seed is None else seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """(delay in seconds, whether the call fails) for the next call"""
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+            failed = self._random.random() < self.error_rate
+        return max(0.0, delay) / 1000, failed
+
+    def call(self, service: str):
+        delay, failed = self.draw()
+        time.sleep(delay)
+        if failed:
+            raise FakeServiceError(f"Injected {service} failure")
+
+    async def acall(self, service: str):
+        delay, failed = self.draw()
+        await asyncio.sleep(delay)
+        if failed:
+            raise FakeServiceError(f"Injected {service} failure")
+
+
+behavior = FakeBehavior()
+fixture_url = os.getenv("FC_FIXTURE_URL", "http://127.0.0.1:8765")
+
+
+################################################################################################
+# Deterministic content
+
+
+def digest(*parts) -> int:
+    return int.from_bytes(hashlib.sha256("\x1f".join(map(str, parts)).encode("utf-8")).digest()[:8], "big")
+
+
+def fake_sentence(*seed, words: int = 12) -> str:
+    rng = random.Random(digest(*seed))
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _schema_get(schema, name: str):
+    # response schemas are either content.Schema protos (SDK) or plain dicts (REST)
+    if isinstance(schema, dict):
+        return schema.get(name)
+    return getattr(schema, name + "_" if name == "type" else name, None)
+
+
+def _schema_type(schema) -> str:
+    kind = _schema_get(schema, "type")
+    return str(getattr(kind, "name", kind) or "").upper()
+
+
+def fake_json(schema, *seed, field: str = "value") -> Any:
+    """A deterministic value that validates against a Gemini response schema
+
+    Args:
+        schema: a content.Schema or its dict form ({"type": "OBJECT", ...}).
+        seed: values the answer is derived from, e.g. the prompt.
+        field: name of the property being generated, used in the text.
+    """
+    kind = _schema_type(schema)
+    h = digest(field, *seed)
+    if kind == "OBJECT":
+        properties = _schema_get(schema, "properties") or {}
+        return {name: fake_json(sub, *seed, field=name) for name, sub in properties.items()}
+    if kind == "ARRAY":
+        items = _schema_get(schema, "items")
+        return [fake_json(items, *seed, i, field=field) for i in range(FAKE_ARRAY_ITEMS)]
+    if kind == "INTEGER":
+        return h % 101
+    if kind == "NUMBER":
+        return round((h % 10001) / 100, 2)
+    if kind == "BOOLEAN":
+        return bool(h % 2)
+    enum = list(_schema_get(schema, "enum") or [])
+    if enum:
+        return enum[h % len(enum)]
+    if field == "questions":
+        return f"Is it true that {fake_sentence(field, *seed, words=8).rstrip('.').lower()}?"
+    return fake_sentence(field, *seed)
+
+
+def fake_answer(prompt: Any, response_schema=None) -> str:
+    """Text of a Gemini answer: JSON matching response_schema, or prose without one"""
+    prompt = str(prompt)
+    if response_schema is not None and _schema_type(response_schema):
+        return json.dumps(fake_json(response_schema, prompt))
+    return " ".join(fake_sentence(prompt, i) for i in range(4))
+
+
+def page_url(n: int) -> str:
+    return f"{fixture_url}/pages/{n}.html"
+
+
+################################################################################################
+# Gemini (google.generativeai and google.genai)
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    """google.generativeai.GenerativeModel answering from its response schema"""
+
+    def __init__(self, model_name: str = None, generation_config=None, **kwargs):
+        self.model_name = model_name
+        self.generation_config = generation_config or {}
+
+    def _response_schema(self):
+        if isinstance(self.generation_config, dict):
+            return self.generation_config.get("response_schema")
+        return getattr(self.generation_config, "response_schema", None)
+
+    def generate_content(self, contents, **kwargs):
+        behavior.call("gemini")
+        return FakeResponse(fake_answer(contents, self._response_schema()))
+
+    async def generate_content_async(self, contents, **kwargs):
+        await behavior.acall("gemini")
+        return FakeResponse(fake_answer(contents, self._response_schema()))
+
+
+class _FakeGenaiModels:
+    def generate_content(self, model: str = None, contents=None, config=None, **kwargs):
+        behavior.call("gemini")
+        # Grounded scam searches answer in the TITLE:/SOURCE:/... block format the prompt asks for
+        blocks = []
+        for i in range(FAKE_ARRAY_ITEMS):
+            n = digest(contents, i) % 1000
+            blocks.append(
+                f"TITLE: {fake_sentence('title', contents, i, words=6)}\n"
+                f"SOURCE: Example News {n % 7}\n"
+                f"SUMMARY: {fake_sentence('summary', contents, i)}\n"
+                f"HOW IT WORKS: {fake_sentence('how', contents, i)}\n"
+                f"WARNING: {fake_sentence('warning', contents, i)}\n"
+                f"URL: {page_url(n)}"
+            )
+        return FakeResponse("\n---\n".join(blocks))
+
+
+class FakeGenaiClient:
+    """google.genai.Client"""
+
+    def __init__(self, api_key: str = None, **kwargs):
+        self.models = _FakeGenaiModels()
+
+
+################################################################################################
+# Groq
+
+
+class _FakeGroqCompletions:
+    def create(self, model: str = None, messages: List[Dict] = None, response_format: Dict = None, **kwargs):
+        behavior.call("groq")
+        prompt = json.dumps(messages or [])
+        if (response_format or {}).get("type") == "json_object":
+            text = json.dumps({"questions": [fake_json({"type": "STRING"}, prompt, i, field="questions") for i in range(FAKE_ARRAY_ITEMS)]})
+        else:
+            text = fake_answer(prompt)
+        message = types.SimpleNamespace(role="assistant", content=text)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(index=0, message=message, finish_reason="stop")])
+
+
+class FakeGroq:
+    """groq.Groq"""
+
+    def __init__(self, api_key: str = None, **kwargs):
+        self.chat = types.SimpleNamespace(completions=_FakeGroqCompletions())
+
+
+################################################################################################
+# NewsAPI
+
+
+class FakeNewsApiClient:
+    """newsapi.newsapi_client.NewsApiClient; articles link to fixture server pages"""
+
+    def __init__(self, api_key: str = None, **kwargs):
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def _articles(self, page_size: int, **query) -> Dict[str, Any]:
+        with self._lock:
+            self._calls += 1
+            call = self._calls
+        articles = []
+        for i in range(page_size):
+            n = digest(json.dumps(query, sort_keys=True), call, i) % 100000
+            articles.append({
+                "source": {"id": None, "name": f"Example News {n % 7}"},
+                "author": "Offline Fixture",
+                "title": fake_sentence("title", n, words=8),
+                "description": fake_sentence("description", n),
+                "url": page_url(n),
+                "urlToImage": None,
+                "publishedAt": "2024-01-01T00:00:00Z",
+                "content": fake_sentence("content", n, words=30),
+            })
+        return {"status": "ok", "totalResults": len(articles), "articles": articles}
+
+    def get_top_headlines(self, page_size: int = 20, **kwargs):
+        behavior.call("newsapi")
+        return self._articles(page_size, **kwargs)
+
+    def get_everything(self, page_size: int = 20, **kwargs):
+        behavior.call("newsapi")
+        return self._articles(page_size, **kwargs)
+
+
+################################################################################################
+# Firestore (in memory)
+
+
+class FakeSnapshot:
+    def __init__(self, reference: "FakeDocumentRef", data: Optional[Dict]):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocumentRef:
+    def __init__(self, store: "FakeFirestore", collection: str, doc_id: str):
+        self._store = store
+        self._collection = collection
+        self.id = doc_id
+
+    def _documents(self) -> Dict[str, Dict]:
+        return self._store._data.setdefault(self._collection, {})
+
+    def set(self, data: Dict, merge: bool = False):
+        with self._store._lock:
+            documents = self._documents()
+            documents[self.id] = {**documents.get(self.id, {}), **data} if merge else dict(data)
+
+    def update(self, fields: Dict):
+        with self._store._lock:
+            documents = self._documents()
+            if self.id not in documents:
+                raise KeyError(f"No document to update: {self._collection}/{self.id}")
+            documents[self.id].update(fields)
+
+    def delete(self):
+        with self._store._lock:
+            self._documents().pop(self.id, None)
+
+    def get(self) -> FakeSnapshot:
+        with self._store._lock:
+            data = self._documents().get(self.id)
+        return FakeSnapshot(self, dict(data) if data is not None else None)
+
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "in": lambda a, b: a in b,
+}
+
+
+class FakeQuery:
+    def __init__(self, collection: "FakeCollection", filters=(), limit: Optional[int] = None):
+        self._collection = collection
+        self._filters = tuple(filters)
+        self._limit = limit
+
+    def where(self, field: str, op: str, value) -> "FakeQuery":
+        return FakeQuery(self._collection, self._filters + ((field, _OPERATORS[op], value),), self._limit)
+
+    def limit(self, count: int) -> "FakeQuery":
+        return FakeQuery(self._collection, self._filters, count)
+
+    def get(self) -> List[FakeSnapshot]:
+        store = self._collection._store
+        with store._lock:
+            documents = list(store._data.get(self._collection.name, {}).items())
+        matches = [
+            FakeSnapshot(self._collection.document(doc_id), dict(data))
+            for doc_id, data in documents
+            if all(field in data and op(data[field], value) for field, op, value in self._filters)
+        ]
+        return matches[: self._limit] if self._limit is not None else matches
+
+    def stream(self):
+        return iter(self.get())
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, store: "FakeFirestore", name: str):
+        self._store = store
+        self.name = name
+        super().__init__(self)
+
+    def document(self, doc_id: str = None) -> FakeDocumentRef:
+        return FakeDocumentRef(self._store, self.name, doc_id or uuid.uuid4().hex)
+
+    def add(self, data: Dict):
+        reference = self.document()
+        reference.set(data)
+        return None, reference
+
+
+class FakeBatch:
+    def __init__(self):
+        self._writes = []
+
+    def set(self, reference: FakeDocumentRef, data: Dict, merge: bool = False):
+        self._writes.append(lambda: reference.set(data, merge=merge))
+
+    def update(self, reference: FakeDocumentRef, fields: Dict):
+        self._writes.append(lambda: reference.update(fields))
+
+    def delete(self, reference: FakeDocumentRef):
+        self._writes.append(reference.delete)
+
+    def commit(self):
+        writes, self._writes = self._writes, []
+        for write in writes:
+            write()
+
+
+class FakeFirestore:
+    """The subset of firestore.Client used by db.database_service"""
+
+    def __init__(self):
+        self._data: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.RLock()
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch()
+
+
+################################################################################################
+# Installation
+
+
+def install(fixture: str = None, fake_behavior: FakeBehavior = None):
+    """Replace the external service clients with the fakes. Call before importing app modules.
+
+    Args:
+        fixture: base URL of a running benchmarks.fixture_server.
+        fake_behavior: latency/error injection, from the FC_FAKE_* variables by default.
+    """
+    global behavior, fixture_url
+    if fake_behavior is not None:
+        behavior = fake_behavior
+    if fixture is not None:
+        fixture_url = fixture.rstrip("/")
+
+    for var in ("GEMINI_API_KEY", "GROQ_API_KEY", "SERPER_API_KEY", "NEWS_API_KEY", "EXT_GEMINI_API"):
+        os.environ.setdefault(var, "offline")
+    os.environ["FC_SERPER_URL"] = f"{fixture_url}/search"
+    os.environ["EXT_GEMINI_BASE_URL"] = fixture_url
+    # Keep the run's caches away from the server's
+    os.environ.setdefault("FC_CACHE_DIR", tempfile.mkdtemp(prefix="fc-offline-"))
+
+    import google.generativeai
+    google.generativeai.GenerativeModel = FakeGenerativeModel
+    google.generativeai.configure = lambda *args, **kwargs: None
+
+    import google.genai
+    google.genai.Client = FakeGenaiClient
+
+    import groq
+    groq.Groq = FakeGroq
+
+    import newsapi
+    import newsapi.newsapi_client
+    newsapi.NewsApiClient = newsapi.newsapi_client.NewsApiClient = FakeNewsApiClient
+
+    firebase = types.ModuleType("firebase")
+    firebase.db = FakeFirestore()
+    sys.modules["firebase"] = firebase
@@ -0,0 +1,107 @@
+"""
+Registry of shared Gemini model handles.
+
+Modules register a named model (model name + generation config/response
+schema) once at import time; the GenerativeModel object is built on first
+use, or eagerly at startup through warm(), and then shared by every request.
+GenerativeModel holds no per-conversation state, so one handle can serve
+concurrent requests. Handles are wrapped so every generate_content call is
+counted and timed in core.metrics under the registered name, and goes
+through the fc.cassette record/replay cassette when one is active.
+"""
+import os
+import threading
+from typing import Dict, Optional
+
+import google.generativeai as genai
+
+from core import metrics
+from fc.cassette import ReplayedText, cassette
+
+_lock = threading.Lock()
+_configured_key: Optional[str] = None
+_specs: Dict[str, dict] = {}
+_models: Dict[str, "MeteredModel"] = {}
+
+
+class MeteredModel:
+    """A GenerativeModel whose generate_content calls are recorded in core.metrics"""
+
+    def __init__(self, name: str, model: "genai.GenerativeModel"):
+        self.name = name
+        self.model = model
+
+    def _cassette_request(self, args, kwargs) -> dict:
+        contents = args[0] if args else kwargs.get("contents")
+        return {"model": self.name, "contents": str(contents)}
+
+    def generate_content(self, *args, **kwargs):
+        if cassette.active:
+            return cassette.play(
+                "gemini", self._cassette_request(args, kwargs), lambda: self._generate(*args, **kwargs),
+                encode=lambda response: response.text, decode=ReplayedText,
+            )
+        return self._generate(*args, **kwargs)
+
+    async def generate_content_async(self, *args, **kwargs):
+        if cassette.active:
+            return await cassette.aplay(
+                "gemini", self._cassette_request(args, kwargs), lambda: self._agenerate(*args, **kwargs),
+                encode=lambda response: response.text, decode=ReplayedText,
+            )
+        return await self._agenerate(*args, **kwargs)
+
+    def _generate(self, *args, **kwargs):
+        with metrics.observe_call("gemini", self.name):
+            return self.model.generate_content(*args, **kwargs)
+
+    async def _agenerate(self, *args, **kwargs):
+        with metrics.observe_call("gemini", self.name):
+            return await self.model.generate_content_async(*args, **kwargs)
+
+    def __getattr__(self, attribute):
+        return getattr(self.model, attribute)
+
+
+def configure(api_key: Optional[str] = None):
+    """Configure the Gemini SDK once per process (again only if the key changes)"""
+    global _configured_key
+    api_key = api_key or os.getenv("GEMINI_API_KEY") or os.getenv("GEMINI_API")
+    with _lock:
+        if api_key != _configured_key:
+            genai.configure(api_key=api_key)
+            _configured_key = api_key
+
+
+def register_model(name: str, model_name: str, generation_config: Optional[dict] = None):
+    """Declare a shared model. Re-registering a name replaces its spec and drops the built handle."""
+    with _lock:
+        _specs[name] = {"model_name": model_name, "generation_config": generation_config}
+        _models.pop(name, None)
+    metrics.register_model_state(f"gemini:{name}", lambda: name in _models)
+
+
+def get_model(name: str) -> MeteredModel:
+    """Return the shared handle for a registered model, building it on first use"""
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    configure()
+    with _lock:
+        model = _models.get(name)
+        if model is None:
+            spec = _specs[name]
+            model = MeteredModel(name, genai.GenerativeModel(
+                model_name=spec["model_name"],
+                generation_config=spec["generation_config"],
+            ))
+            _models[name] = model
+        return model
+
+
+def warm():
+    """Build every registered model up front, keeping construction off the request path"""
+    for name in list(_specs):
+        get_model(name)
+    return sorted(_models)
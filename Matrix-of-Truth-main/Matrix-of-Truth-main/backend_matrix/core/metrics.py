@@ -0,0 +1,315 @@
+"""
+Process-wide metrics, rendered in the Prometheus text exposition format at /metrics.
+
+Counters, gauges and histograms are declared once at import time and updated
+from the request middleware, around outbound calls (observe_call) and around
+scheduler jobs (observe_job). Values that are cheaper to read than to track -
+cache hit ratios, model load state, process RSS - are filled in by collectors
+that run on every scrape.
+"""
+import math
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds; covers fast cache-backed routes up to multi-call LLM pipelines
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+JOB_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+_registry: List["_Metric"] = []
+_collectors: List[Callable[[], None]] = []
+_model_states: Dict[str, Callable[[], bool]] = {}
+_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        with _lock:
+            _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. requests or errors"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. in-flight requests or memory"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (latencies) in cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, dict(state, counts=list(state["counts"]))) for key, state in self._values.items())
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+################################################################################################
+# Metrics
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests handled, by router and route template",
+    ("router", "route", "method", "status"),
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Time to the response headers, by router and route template",
+    ("router", "route"),
+)
+http_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being handled")
+
+external_calls = Counter(
+    "external_calls_total", "Calls to external APIs (gemini, serper, newsapi), by outcome",
+    ("service", "operation", "outcome"),
+)
+external_call_duration = Histogram(
+    "external_call_duration_seconds", "Latency of calls to external APIs",
+    ("service", "operation"),
+)
+external_call_errors = Counter(
+    "external_call_errors_total", "Failed external API calls, by exception class",
+    ("service", "operation", "error"),
+)
+
+job_runs = Counter("scheduler_job_runs_total", "APScheduler job runs, by outcome", ("job", "outcome"))
+job_duration = Histogram(
+    "scheduler_job_duration_seconds", "Duration of APScheduler job runs", ("job",), buckets=JOB_BUCKETS
+)
+
+cache_lookups = Gauge("cache_lookups", "Lookups per cache since start, by result", ("cache", "result"))
+cache_hit_ratio = Gauge("cache_hit_ratio", "Hit ratio per cache since start", ("cache",))
+model_loaded = Gauge("model_loaded", "1 if the model is loaded in this process, 0 if not yet", ("model",))
+process_rss = Gauge("process_resident_memory_bytes", "Resident set size of the server process")
+
+
+################################################################################################
+# Instrumentation helpers
+
+
+@contextmanager
+def observe_call(service: str, operation: str):
+    """Time an outbound API call and count it, recording the exception class if it fails
+
+    Args:
+        service: the external API ("gemini", "serper", "newsapi").
+        operation: what the call is for, e.g. the registered model name.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        external_calls.inc(service=service, operation=operation, outcome="error")
+        external_call_errors.inc(service=service, operation=operation, error=type(e).__name__)
+        raise
+    else:
+        external_calls.inc(service=service, operation=operation, outcome="success")
+    finally:
+        external_call_duration.observe(time.perf_counter() - start, service=service, operation=operation)
+
+
+@contextmanager
+def observe_job(job: str):
+    """Time one run of a scheduler job"""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        job_runs.inc(job=job, outcome="error")
+        raise
+    else:
+        job_runs.inc(job=job, outcome="success")
+    finally:
+        job_duration.observe(time.perf_counter() - start, job=job)
+
+
+def register_collector(collector: Callable[[], None]):
+    """Run collector (which sets gauges) before every scrape"""
+    with _lock:
+        _collectors.append(collector)
+
+
+def register_model_state(name: str, is_loaded: Callable[[], bool]):
+    """Report model_loaded{model=name} from is_loaded() at every scrape"""
+    with _lock:
+        _model_states[name] = is_loaded
+
+
+def record_cache_stats(stats: Dict[str, Dict[str, float]]):
+    """Export fc.cache.cache_stats()-shaped counters as gauges"""
+    for name, cache in stats.items():
+        cache_lookups.set(cache["hits"], cache=name, result="hit")
+        cache_lookups.set(cache["misses"], cache=name, result="miss")
+        cache_hit_ratio.set(cache["hit_ratio"], cache=name)
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """Current RSS from /proc, or the peak RSS where /proc is not available"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _collect_builtin():
+    rss = resident_memory_bytes()
+    if rss is not None:
+        process_rss.set(rss)
+    with _lock:
+        states = dict(_model_states)
+    for name, is_loaded in states.items():
+        try:
+            model_loaded.set(1 if is_loaded() else 0, model=name)
+        except Exception:
+            model_loaded.set(0, model=name)
+
+
+def render() -> str:
+    """Every metric in the Prometheus text format (version 0.0.4)"""
+    with _lock:
+        collectors = list(_collectors)
+    for collector in [_collect_builtin] + collectors:
+        try:
+            collector()
+        except Exception as e:
+            print(f"Metrics collector failed: {str(e)}")
+    with _lock:
+        metrics = list(_registry)
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+################################################################################################
+# Request middleware
+
+_router_names: Dict[Callable, str] = {}
+
+
+def label_routers(routers: Dict[str, object]):
+    """Name the routers whose requests are counted, e.g. {"news_router": news_router}
+
+    Requests are labelled with the router that owns the matched endpoint;
+    endpoints declared directly on the app are labelled "app".
+    """
+    for name, api_router in routers.items():
+        for route in api_router.routes:
+            endpoint = getattr(route, "endpoint", None)
+            if endpoint is not None:
+                _router_names[endpoint] = name
+
+
+async def metrics_middleware(request, call_next):
+    """HTTP middleware: in-flight gauge, plus request count and latency per router and route template"""
+    http_in_flight.inc()
+    start = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        http_in_flight.dec()
+        # The matched route is known only after routing; templates keep the label set bounded
+        route = request.scope.get("route")
+        if route is None:
+            router, path = "none", "unmatched"
+        else:
+            router = _router_names.get(getattr(route, "endpoint", None), "app")
+            path = getattr(route, "path", "unmatched")
+        http_requests.inc(router=router, route=path, method=request.method, status=status)
+        http_request_duration.observe(time.perf_counter() - start, router=router, route=path)
@@ -6,6 +6,7 @@ from tensorflow.keras.models import load_model
 from tensorflow.keras.preprocessing import image
 from PIL import Image
 from PIL.ExifTags import TAGS
+from core.metrics import register_model_state
 
 # Load the saved model
 # model_path = "deepfake_detector.h5"
@@ -17,6 +18,7 @@ model_path = os.path.join(current_dir, "deepfake_detector.h5")
 
 # Lazy load model (only load when first needed, not at import time)
 _model = None
+register_model_state("deepfake_detector", lambda: _model is not None)
 
 def get_model():
     global _model
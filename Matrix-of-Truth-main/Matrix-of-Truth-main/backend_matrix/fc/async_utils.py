@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide event loop behind run_sync, started in a daemon thread on first use
+
+    It lives as long as the process, so the clients bound to it (the pooled
+    crawler client, the async Gemini clients) stay usable across calls.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="run-sync-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    Every call runs on the same background loop (see background_loop), so a
+    script can call the blocking wrappers any number of times. Code that is
+    already running on an event loop must await the coroutine instead:
+    blocking here would stall that loop.
+
+    Args:
+        coro: the coroutine to run.
+    Returns:
+        The result of the coroutine.
+    Raises:
+        RuntimeError: if called from a thread that is running an event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from a running event loop; await the coroutine instead")
+
+    return asyncio.run_coroutine_threadsafe(coro, background_loop()).result()
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+CACHE_DIR = os.getenv("FC_CACHE_DIR", "./cache")
+
+# Every TieredCache registers itself here so its counters can be reported together
+_registry: Dict[str, "TieredCache"] = {}
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share one cache entry.
+
+    Args:
+        text: the raw text (claim, query, URL ...).
+    Returns:
+        The NFKC-normalized, case-folded text with whitespace collapsed.
+    """
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.casefold().split())
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for use as a key: lower-case scheme and host, drop the fragment.
+
+    The path and query are kept verbatim since they can be case-sensitive.
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+def content_key(text: str, *parts) -> str:
+    """Content-addressed cache key: sha256 of the normalized text plus any extra parts"""
+    raw = "\x1f".join([normalize_text(text)] + [str(part) for part in parts])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Bounded in-memory LRU with a per-entry expiry time. Thread-safe.
+
+    Args:
+        max_entries: the most entries kept.
+        max_bytes: optional bound on the summed sizeof() of the entries; a
+            single value larger than this is not kept at all.
+        sizeof: size of a value, required with max_bytes.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("max_bytes needs a sizeof function")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, tuple[float, Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (time.time() + ttl, value, size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """Persistent key/value tier backed by a single SQLite file. Values are stored as JSON."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, expires_at REAL, value TEXT)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        """Return (value, expires_at) for a live entry, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, time.time() + ttl, json.dumps(value)),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def prune(self):
+        """Drop every expired entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+
+class TieredCache:
+    """Memory LRU in front of an optional on-disk SQLite tier, with TTLs and hit/miss counters.
+
+    Args:
+        name: cache name, also used for the SQLite file name and in stats.
+        ttl: default time-to-live of an entry in seconds.
+        max_entries: capacity of the in-memory LRU.
+        persist: whether to keep a disk tier under FC_CACHE_DIR.
+        max_bytes: optional size bound of the in-memory LRU, measured with sizeof.
+        sizeof: size of a value, required with max_bytes.
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 256, persist: bool = True,
+                 max_bytes: Optional[int] = None, sizeof: Optional[Callable[[Any], int]] = None):
+        self.name = name
+        self.ttl = ttl
+        self.memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes, sizeof=sizeof)
+        self.disk = None
+        if persist:
+            try:
+                self.disk = SQLiteCache(os.path.join(CACHE_DIR, f"{name}.sqlite3"))
+                self.disk.prune()
+            except Exception as e:
+                print(f"Warning: disk cache '{name}' unavailable, using memory only: {e}")
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        _registry[name] = self
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count(memory_hit=True)
+            return value
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                # Promote to memory for the remainder of its lifetime
+                self.memory.set(key, value, ttl=expires_at - time.time())
+                self._count(disk_hit=True)
+                return value
+        self._count()
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        self.memory.set(key, value, ttl=ttl)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, ttl=ttl)
+            except Exception as e:
+                print(f"Warning: could not persist cache entry in '{self.name}': {e}")
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def _count(self, memory_hit: bool = False, disk_hit: bool = False):
+        with self._counter_lock:
+            if memory_hit or disk_hit:
+                self.hits += 1
+                self.memory_hits += memory_hit
+                self.disk_hits += disk_hit
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.total_bytes,
+            "ttl_seconds": self.ttl,
+        }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters of every cache created in this process, keyed by cache name"""
+    return {name: cache.stats() for name, cache in _registry.items()}
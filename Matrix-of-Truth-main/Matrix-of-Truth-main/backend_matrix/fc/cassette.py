@@ -0,0 +1,171 @@
+"""
+Record/replay of outbound calls, for benchmarking the pipeline on real traffic samples.
+
+With FC_CASSETTE_MODE=record every Serper query, crawled page, newspaper
+download and Gemini answer is passed through as usual and also appended to
+a gzip-compressed JSON-lines cassette (FC_CASSETTE_PATH). With
+FC_CASSETTE_MODE=replay the same calls are answered from the cassette,
+held in memory, without touching the network: a request that was not
+recorded raises CassetteMiss (crawled pages come back as failed fetches).
+The default mode, "off", adds nothing to the call path.
+
+Entries are keyed by call kind plus the request (query, URL, or model and
+prompt), so replay does not depend on the order or the batching of calls.
+Record with a single server process; several writers would interleave
+their lines in the same file.
+"""
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+CASSETTE_MODES = ("off", "record", "replay")
+CASSETTE_MODE = os.getenv("FC_CASSETTE_MODE", "off")
+CASSETTE_PATH = os.getenv("FC_CASSETTE_PATH", "fc_cassette.jsonl.gz")
+
+
+class CassetteMiss(Exception):
+    """The replayed request is not in the cassette"""
+
+
+def _entry_key(kind: str, request: Any) -> str:
+    canonical = json.dumps([kind, request], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ReplayedResponse:
+    """The parts of an HTTP response the pipeline reads (status_code, text, json())"""
+
+    def __init__(self, body: Any, status_code: int = 200):
+        self.status_code = status_code
+        self.text = json.dumps(body)
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class ReplayedText:
+    """A Gemini answer read back from the cassette; only .text is kept"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class Cassette:
+    """A cassette file in record or replay mode (or "off")
+
+    Args:
+        mode: one of CASSETTE_MODES.
+        path: the gzip JSON-lines file.
+    """
+
+    def __init__(self, mode: str = CASSETTE_MODE, path: str = CASSETTE_PATH):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}, expected one of {CASSETTE_MODES}")
+        self.mode = mode
+        self.path = path
+        self._entries: Optional[Dict[str, Any]] = None
+        self._writer = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    @property
+    def active(self) -> bool:
+        return self.mode != "off"
+
+    def _load(self) -> Dict[str, Any]:
+        # Loaded on first use, so parse-pool workers importing this module never read the file
+        with self._lock:
+            if self._entries is None:
+                entries = {}
+                if os.path.exists(self.path):
+                    with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                        for line in f:
+                            if line.strip():
+                                entry = json.loads(line)
+                                entries[entry["key"]] = entry["response"]
+                self._entries = entries
+            return self._entries
+
+    def lookup(self, kind: str, request: Any) -> Any:
+        """The recorded response of a request
+
+        Raises:
+            CassetteMiss: if the request was not recorded.
+        """
+        entries = self._load()
+        key = _entry_key(kind, request)
+        if key not in entries:
+            self.misses += 1
+            raise CassetteMiss(f"No recorded {kind} response for {str(request)[:200]}")
+        self.hits += 1
+        return entries[key]
+
+    def record(self, kind: str, request: Any, response: Any):
+        """Append a response to the cassette (later recordings of a request win on replay)"""
+        key = _entry_key(kind, request)
+        line = json.dumps({"kind": kind, "key": key, "request": request, "response": response}, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._writer is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # Appending adds a gzip member per session, which gzip.open reads back as one stream
+                self._writer = gzip.open(self.path, "at", encoding="utf-8")
+                atexit.register(self.close)
+            self._writer.write(line + "\n")
+            self.recorded += 1
+
+    def play(self, kind: str, request: Any, call: Callable[[], Any],
+             encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None) -> Any:
+        """Run call() through the cassette
+
+        Args:
+            kind: the call kind ("serper", "page", "newspaper", "gemini").
+            request: JSON-serializable description of the request, the replay key.
+            call: performs the real request.
+            encode: turns call()'s result into something JSON-serializable.
+            decode: turns the recorded value back into call()'s result type.
+        """
+        if self.mode == "replay":
+            value = self.lookup(kind, request)
+            return decode(value) if decode else value
+        result = call()
+        if self.mode == "record":
+            self.record(kind, request, encode(result) if encode else result)
+        return result
+
+    async def aplay(self, kind: str, request: Any, call: Callable[[], Awaitable[Any]],
+                    encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None) -> Any:
+        """Awaitable variant of play for coroutine calls"""
+        if self.mode == "replay":
+            value = self.lookup(kind, request)
+            return decode(value) if decode else value
+        result = await call()
+        if self.mode == "record":
+            self.record(kind, request, encode(result) if encode else result)
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded,
+        }
+
+
+cassette = Cassette()
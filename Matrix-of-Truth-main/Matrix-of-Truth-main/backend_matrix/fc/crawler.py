@@ -0,0 +1,374 @@
+import asyncio
+import codecs
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from .cassette import CassetteMiss, cassette
+from .document_store import FetchedDocument
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.14; rv:65.0) Gecko/20100101 Firefox/65.0"
+
+# Pool sizing for the shared crawler client
+CRAWL_MAX_CONNECTIONS = int(os.getenv("FC_CRAWL_MAX_CONNECTIONS", 100))
+CRAWL_MAX_KEEPALIVE = int(os.getenv("FC_CRAWL_MAX_KEEPALIVE", 20))
+CRAWL_KEEPALIVE_EXPIRY = float(os.getenv("FC_CRAWL_KEEPALIVE_EXPIRY", 30))
+CRAWL_TIMEOUT = float(os.getenv("FC_CRAWL_TIMEOUT", 3))
+CRAWL_HTTP2 = os.getenv("FC_CRAWL_HTTP2", "1") == "1" and HTTP2_AVAILABLE
+
+# Bodies are streamed and cut off after this many bytes; other content types are not downloaded
+CRAWL_MAX_BYTES = int(os.getenv("FC_CRAWL_MAX_BYTES", 2 * 1024 * 1024))
+CRAWL_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+# Politeness and load limits: fetches in flight overall and per host
+CRAWL_GLOBAL_CONCURRENCY = int(os.getenv("FC_CRAWL_GLOBAL_CONCURRENCY", 32))
+CRAWL_PER_HOST_CONCURRENCY = int(os.getenv("FC_CRAWL_PER_HOST_CONCURRENCY", 4))
+# Overall budget of one crawl_web call; unfinished fetches fall back to the Serper snippet
+CRAWL_DEADLINE = float(os.getenv("FC_CRAWL_DEADLINE", 6))
+# Hosts whose smoothed latency exceeds this many seconds are crawled after every other host;
+# once that estimate rests on FC_CRAWL_SLOW_HOST_MIN_SAMPLES samples the host is skipped,
+# except for a probe whenever its last sample is FC_CRAWL_SLOW_HOST_PROBE seconds old, so it can recover
+CRAWL_SLOW_HOST_SECONDS = float(os.getenv("FC_CRAWL_SLOW_HOST_SECONDS", 2.5))
+CRAWL_SLOW_HOST_MIN_SAMPLES = int(os.getenv("FC_CRAWL_SLOW_HOST_MIN_SAMPLES", 3))
+CRAWL_SLOW_HOST_PROBE = float(os.getenv("FC_CRAWL_SLOW_HOST_PROBE", 60))
+# Latency estimates older than this are forgotten
+CRAWL_LATENCY_TTL = float(os.getenv("FC_CRAWL_LATENCY_TTL", 10 * 60))
+CRAWL_LATENCY_ALPHA = 0.3
+
+
+def is_text_content(content_type: str) -> bool:
+    """Whether a Content-Type header announces a page worth parsing (a missing header is accepted)"""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return not media_type or media_type in CRAWL_CONTENT_TYPES
+
+
+def host_of(url: str) -> str:
+    try:
+        return urlsplit(url).netloc.lower()
+    except ValueError:
+        return ""
+
+
+@dataclass
+class _HostLatency:
+    """Smoothed latency of a host, the number of samples behind it and when the last one was taken"""
+    seconds: float
+    samples: int
+    updated: float
+
+
+async def _close_at_loop_shutdown(client: httpx.AsyncClient):
+    """Async generator parked on a loop until the loop shuts down, then closes client
+
+    asyncio.run() finalizes every async generator of its loop (shutdown_asyncgens)
+    before closing it, so a client that nobody closed explicitly still releases
+    its connections while its loop can run the cleanup.
+    """
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+class _LoopState:
+    """Client and semaphores of one event loop (asyncio primitives are loop-bound)"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient):
+        self.loop = loop
+        self.client = client
+        self.slots = asyncio.Semaphore(CRAWL_GLOBAL_CONCURRENCY)
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+        # Started on the running loop, which registers it for shutdown_asyncgens
+        self._closer = _close_at_loop_shutdown(client)
+        asyncio.ensure_future(self._closer.__anext__())
+
+    def host_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self.host_slots.get(host)
+        if slot is None:
+            slot = self.host_slots[host] = asyncio.Semaphore(CRAWL_PER_HOST_CONCURRENCY)
+        return slot
+
+
+class Crawler:
+    """Process-wide HTTP client service shared by every crawl and search request.
+
+    One pooled httpx.AsyncClient is kept per event loop (an AsyncClient cannot be
+    shared across loops), so TCP/TLS connections are kept alive per host and
+    reused between requests, over HTTP/2 when the h2 package is installed.
+    In the server there is a single loop and hence a single client; sync helpers
+    share the client of run_sync's background loop. A client nobody closed is
+    closed when its loop shuts down (see _close_at_loop_shutdown).
+
+    GETs are limited to FC_CRAWL_GLOBAL_CONCURRENCY in flight overall and
+    FC_CRAWL_PER_HOST_CONCURRENCY per host, and the latency of every host is
+    tracked as an exponentially weighted moving average (a timeout counts as
+    the full timeout, other failures as the time they took) so that slow hosts
+    are crawled last, and skipped once they are consistently slow.
+    """
+
+    def __init__(self):
+        self._loops: Dict[int, _LoopState] = {}
+        self._lock = threading.Lock()
+        self._latency: Dict[str, _HostLatency] = {}
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.deadline_cancelled = 0
+        self.rejected_content_type = 0
+        self.truncated = 0
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=CRAWL_MAX_CONNECTIONS,
+            max_keepalive_connections=CRAWL_MAX_KEEPALIVE,
+            keepalive_expiry=CRAWL_KEEPALIVE_EXPIRY,
+        )
+        transport = httpx.AsyncHTTPTransport(retries=3, http2=CRAWL_HTTP2, limits=limits)
+        return httpx.AsyncClient(
+            transport=transport,
+            headers={"User-Agent": USER_AGENT},
+            timeout=CRAWL_TIMEOUT,
+            follow_redirects=True,
+        )
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Forget clients whose loop is gone; they were closed at the loop's shutdown
+            for key in [k for k, state in self._loops.items() if state.loop.is_closed()]:
+                del self._loops[key]
+            state = self._loops.get(id(loop))
+            if state is None:
+                state = self._loops[id(loop)] = _LoopState(loop, self._build_client())
+            return state
+
+    def client(self) -> httpx.AsyncClient:
+        """Return the pooled client of the running event loop, creating it on first use"""
+        return self._state().client
+
+    def _host_entry(self, url: str) -> Optional[_HostLatency]:
+        entry = self._latency.get(host_of(url))
+        if entry is None or time.time() - entry.updated > CRAWL_LATENCY_TTL:
+            return None
+        return entry
+
+    def host_latency(self, url: str) -> Optional[float]:
+        """Smoothed latency in seconds of the host of url, None if unknown or expired"""
+        entry = self._host_entry(url)
+        return entry.seconds if entry is not None else None
+
+    def is_slow(self, url: str) -> bool:
+        """Whether the host of url currently looks slow (it is then crawled last)"""
+        latency = self.host_latency(url)
+        return latency is not None and latency > CRAWL_SLOW_HOST_SECONDS
+
+    def should_skip(self, url: str) -> bool:
+        """Whether to leave out the host of url: consistently slow and probed recently"""
+        entry = self._host_entry(url)
+        return (
+            entry is not None
+            and entry.seconds > CRAWL_SLOW_HOST_SECONDS
+            and entry.samples >= CRAWL_SLOW_HOST_MIN_SAMPLES
+            and time.time() - entry.updated < CRAWL_SLOW_HOST_PROBE
+        )
+
+    def _record_latency(self, host: str, seconds: float):
+        with self._lock:
+            now = time.time()
+            entry = self._latency.get(host)
+            if entry is None or now - entry.updated > CRAWL_LATENCY_TTL:
+                self._latency[host] = _HostLatency(seconds, 1, now)
+            else:
+                entry.seconds = CRAWL_LATENCY_ALPHA * seconds + (1 - CRAWL_LATENCY_ALPHA) * entry.seconds
+                entry.samples += 1
+                entry.updated = now
+
+    async def gather_prioritized(
+        self,
+        urls: List[str],
+        fetch: Callable[[str], Awaitable[Any]],
+        deadline: Optional[float] = None,
+    ) -> List[Any]:
+        """Run fetch(url) for every url concurrently within one overall deadline.
+
+        Fetches are started fastest host first so they win the crawl slots,
+        and hosts that look slow come last; hosts that have been slow for
+        several samples are skipped between probes. Whatever has not finished
+        at the deadline is cancelled, along with the download underneath it.
+
+        Args:
+            urls (list): the pages to fetch.
+            fetch (callable): coroutine function called with one url.
+            deadline (float, optional): seconds for the whole batch, FC_CRAWL_DEADLINE by default.
+
+        Returns:
+            list: fetch's result per url, in input order; None for skipped,
+                failed or unfinished fetches.
+        """
+        deadline = CRAWL_DEADLINE if deadline is None else deadline
+        order = sorted(
+            range(len(urls)),
+            key=lambda i: (self.is_slow(urls[i]), self.host_latency(urls[i]) or 0.0),
+        )
+        tasks = {}
+        for i in order:
+            if self.should_skip(urls[i]):
+                self.skipped += 1
+                continue
+            tasks[i] = asyncio.ensure_future(fetch(urls[i]))
+
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+            for task in pending:
+                task.cancel()
+            self.deadline_cancelled += len(pending)
+            # Wait for the cancelled fetches to unwind so their crawl slots are free again
+            if pending:
+                await asyncio.wait(pending)
+
+        results = []
+        for i in range(len(urls)):
+            task = tasks.get(i)
+            if task is None or task.cancelled() or not task.done() or task.exception() is not None:
+                results.append(None)
+            else:
+                results.append(task.result())
+        return results
+
+    async def get(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None):
+        """GET a page through the pooled client, streaming at most FC_CRAWL_MAX_BYTES of it
+
+        The status and Content-Type are checked from the headers before any of
+        the body is read, so media files and PDFs are never downloaded. The body
+        is decoded incrementally and cut off at the byte cap.
+
+        Args:
+            url (str): the page to fetch.
+            headers (dict, optional): extra request headers.
+            timeout (float, optional): overrides FC_CRAWL_TIMEOUT.
+
+        Returns:
+            FetchedDocument: the page if the status is 200 and it is HTML or
+                text, otherwise None.
+        """
+        if cassette.active:
+            # Failed fetches are recorded too; a page missing from the cassette is a failed fetch
+            try:
+                return await cassette.aplay(
+                    "page", url, lambda: self._fetch(url, headers, timeout),
+                    encode=lambda document: asdict(document) if document is not None else None,
+                    decode=lambda fields: FetchedDocument(**fields) if fields is not None else None,
+                )
+            except CassetteMiss:
+                self.errors += 1
+                return None
+        return await self._fetch(url, headers, timeout)
+
+    async def _fetch(self, url: str, headers: Optional[dict], timeout: Optional[float]):
+        timeout = CRAWL_TIMEOUT if timeout is None else timeout
+        state = self._state()
+        host = host_of(url)
+        async with state.slots, state.host_slot(host):
+            self.requests += 1
+            start = time.perf_counter()
+            responded = False
+            try:
+                async with state.client.stream("GET", url, headers=headers, timeout=timeout) as response:
+                    # Latency to the response headers, independent of the page size
+                    responded = True
+                    self._record_latency(host, time.perf_counter() - start)
+                    content_type = response.headers.get("content-type", "")
+                    if response.status_code != 200:
+                        return None
+                    if not is_text_content(content_type):
+                        self.rejected_content_type += 1
+                        return None
+                    text, truncated = await self._read_capped(response)
+            except httpx.TimeoutException:
+                self.errors += 1
+                self.timeouts += 1
+                self._record_latency(host, max(time.perf_counter() - start, timeout))
+                return None
+            except asyncio.CancelledError:
+                # Cut off by the crawl deadline: the host took at least this long to answer
+                if not responded:
+                    self._record_latency(host, time.perf_counter() - start)
+                raise
+            except Exception:
+                # Other failures (refused or reset connections) count for the time they actually took
+                self.errors += 1
+                self._record_latency(host, time.perf_counter() - start)
+                return None
+        return FetchedDocument(
+            url=str(response.url),
+            status_code=response.status_code,
+            content_type=content_type,
+            text=text,
+            truncated=truncated,
+        )
+
+    async def _read_capped(self, response: httpx.Response) -> Tuple[str, bool]:
+        """Decode a streamed body chunk by chunk, stopping after CRAWL_MAX_BYTES
+
+        The cap counts the body after Content-Encoding decoding, since a
+        gzip or brotli page can inflate to many times its transfer size.
+        """
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            if size + len(chunk) > CRAWL_MAX_BYTES:
+                chunks.append(decoder.decode(chunk[: CRAWL_MAX_BYTES - size]))
+                self.truncated += 1
+                return "".join(chunks), True
+            size += len(chunk)
+            chunks.append(decoder.decode(chunk))
+        chunks.append(decoder.decode(b"", final=True))
+        return "".join(chunks), False
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """POST through the pooled client; errors are raised to the caller"""
+        # API calls (Serper) are not subject to the crawl caps
+        self.requests += 1
+        return await self.client().post(url, **kwargs)
+
+    async def aclose(self):
+        """Close the client of the running loop (called from the FastAPI lifespan)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._loops.pop(id(loop), None)
+        if state is not None:
+            await state.client.aclose()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "clients": len(self._loops),
+            "http2": CRAWL_HTTP2,
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected_content_type": self.rejected_content_type,
+            "truncated": self.truncated,
+            "skipped_slow_host": self.skipped,
+            "deadline_cancelled": self.deadline_cancelled,
+            "hosts_tracked": len(self._latency),
+            "slow_hosts": sum(entry.seconds > CRAWL_SLOW_HOST_SECONDS for entry in self._latency.values()),
+        }
+
+
+crawler = Crawler()
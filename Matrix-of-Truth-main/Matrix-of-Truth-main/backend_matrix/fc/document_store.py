@@ -0,0 +1,52 @@
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+from .cache import TieredCache, normalize_url
+
+# Fetched pages are shared by snippet extension and article summarization
+DOCUMENT_TTL = int(os.getenv("FC_DOCUMENT_TTL", 15 * 60))
+DOCUMENT_CACHE_SIZE = int(os.getenv("FC_DOCUMENT_CACHE_SIZE", 256))
+# Pages can be up to FC_CRAWL_MAX_BYTES each, so the store is also bounded by the memory of their text
+DOCUMENT_CACHE_BYTES = int(os.getenv("FC_DOCUMENT_CACHE_BYTES", 64 * 1024 * 1024))
+
+
+@dataclass
+class FetchedDocument:
+    """A downloaded web page.
+
+    Exposes the same url/text attributes as an httpx response, so the snippet
+    extension code can use either interchangeably. truncated is set when the
+    crawler stopped reading the body at its byte cap.
+    """
+    url: str
+    status_code: int
+    content_type: str
+    text: str
+    truncated: bool = False
+
+
+def document_size(document: FetchedDocument) -> int:
+    """Memory held by a page's text, the bulk of a FetchedDocument"""
+    return sys.getsizeof(document.text)
+
+
+class DocumentStore:
+    """Memory-only store of fetched pages keyed by normalized URL, bounded by TTL, count and total size"""
+
+    def __init__(self, ttl: float = DOCUMENT_TTL, max_entries: int = DOCUMENT_CACHE_SIZE,
+                 max_bytes: int = DOCUMENT_CACHE_BYTES):
+        self.cache = TieredCache(
+            "documents", ttl=ttl, max_entries=max_entries, persist=False, max_bytes=max_bytes, sizeof=document_size
+        )
+
+    def get(self, url: str) -> Optional[FetchedDocument]:
+        return self.cache.get(normalize_url(url))
+
+    def put(self, url: str, document: FetchedDocument) -> FetchedDocument:
+        self.cache.set(normalize_url(url), document)
+        return document
+
+
+document_store = DocumentStore()
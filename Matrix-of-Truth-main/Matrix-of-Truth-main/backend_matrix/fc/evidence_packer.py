@@ -0,0 +1,127 @@
+import os
+import re
+from typing import List
+
+import numpy as np
+
+# Upper bound on the evidence pasted into the enhanced report prompt (~4 characters per token)
+EVIDENCE_TOKEN_BUDGET = int(os.getenv("FC_EVIDENCE_TOKEN_BUDGET", 3000))
+# Passages whose term vectors are at least this similar to an already packed one are dropped
+EVIDENCE_DUPLICATE_THRESHOLD = float(os.getenv("FC_EVIDENCE_DUPLICATE_THRESHOLD", 0.9))
+CHARS_PER_TOKEN = 4
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his in is it its of on or she that the their "
+    "there they this to was were which who will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def _vectorize(passages: List[str]):
+    """Tokens, vocabulary and term-frequency matrix (passages x vocabulary) of the passages"""
+    documents = [tokenize(passage) for passage in passages]
+    vocabulary = {}
+    for tokens in documents:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+    matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    for row, tokens in enumerate(documents):
+        np.add.at(matrix[row], [vocabulary[token] for token in tokens], 1.0)
+    return documents, vocabulary, matrix
+
+
+def _bm25(query: str, documents: List[List[str]], vocabulary: dict, tf: np.ndarray) -> np.ndarray:
+    query_columns = sorted({vocabulary[token] for token in tokenize(query) if token in vocabulary})
+    if not query_columns:
+        return np.zeros(len(documents), dtype=np.float32)
+
+    tf = tf[:, query_columns]
+    n_documents = len(documents)
+    document_frequency = (tf > 0).sum(axis=0)
+    idf = np.log((n_documents - document_frequency + 0.5) / (document_frequency + 0.5) + 1.0)
+    lengths = np.array([len(tokens) for tokens in documents], dtype=np.float32)
+    length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(lengths.mean(), 1.0))
+    return (idf * tf * (BM25_K1 + 1) / (tf + length_norm[:, None])).sum(axis=1)
+
+
+def _unit_rows(tf: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(tf, axis=1, keepdims=True)
+    return tf / np.where(norms == 0, 1.0, norms)
+
+
+def unit_term_vectors(passages: List[str]) -> np.ndarray:
+    """L2-normalized term vectors; the dot product of two rows is their cosine similarity"""
+    return _unit_rows(_vectorize(passages)[2])
+
+
+def bm25_scores(query: str, passages: List[str]) -> np.ndarray:
+    """BM25 score of every passage against the query
+
+    Args:
+        query: the claim.
+        passages: the evidence passages.
+    Returns:
+        A float array with one score per passage.
+    """
+    return _bm25(query, *_vectorize(passages))
+
+
+def pack_evidence(
+    claim: str,
+    passages: List[str],
+    token_budget: int = None,
+    duplicate_threshold: float = None,
+) -> List[str]:
+    """Pick the evidence passages that go into the report prompt.
+
+    Passages are ranked against the claim with BM25, near-duplicates of an
+    already chosen passage are dropped, and the best remaining passages are
+    packed until the token budget is used up. A single passage longer than
+    the whole budget is truncated rather than left out.
+
+    Args:
+        claim: the claim being fact-checked.
+        passages: the evidence passages (article summaries).
+        token_budget: FC_EVIDENCE_TOKEN_BUDGET by default.
+        duplicate_threshold: FC_EVIDENCE_DUPLICATE_THRESHOLD by default.
+    Returns:
+        The chosen passages, most relevant first.
+    """
+    token_budget = EVIDENCE_TOKEN_BUDGET if token_budget is None else token_budget
+    duplicate_threshold = EVIDENCE_DUPLICATE_THRESHOLD if duplicate_threshold is None else duplicate_threshold
+    passages = [passage for passage in passages if passage and passage.strip()]
+    if not passages:
+        return []
+
+    documents, vocabulary, tf = _vectorize(passages)
+    scores = _bm25(claim, documents, vocabulary, tf)
+    vectors = _unit_rows(tf)
+    # Stable, so ties keep the retrieval order
+    ranking = np.argsort(-scores, kind="stable")
+
+    packed, chosen, used = [], [], 0
+    for index in ranking:
+        if chosen and float((vectors[chosen] @ vectors[index]).max()) >= duplicate_threshold:
+            continue
+        cost = estimate_tokens(passages[index])
+        if used + cost > token_budget:
+            if not packed:
+                packed.append(passages[index][: token_budget * CHARS_PER_TOKEN])
+                chosen.append(index)
+                used = token_budget
+            continue
+        packed.append(passages[index])
+        chosen.append(index)
+        used += cost
+    return packed
@@ -3,6 +3,7 @@ from google.ai.generativelanguage_v1beta.types import content
 import os
 from typing import Dict
 import json
+from core import llm_registry
 
 
 generation_config = {
@@ -59,10 +60,7 @@ generation_config = {
     "response_mime_type": "application/json"
 }
 
-model = genai.GenerativeModel(
-    model_name="gemini-2.0-flash",
-    generation_config=generation_config
-)
+llm_registry.register_model("explain", "gemini-2.0-flash", generation_config)
 
 def explain_factcheck_result(factcheck_report: Dict) -> Dict:
     # Extract relevant components from the fact-check report
@@ -85,7 +83,7 @@ def explain_factcheck_result(factcheck_report: Dict) -> Dict:
     4. What factors influenced the trust assessment
     """
 
-    response = model.generate_content(prompt)
+    response = llm_registry.get_model("explain").generate_content(prompt)
     explanation = json.loads(response.text)
     
     return {
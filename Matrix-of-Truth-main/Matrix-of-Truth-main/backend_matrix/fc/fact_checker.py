@@ -8,169 +8,246 @@ from dataclasses import dataclass
 from datetime import datetime
 import requests
 from urllib.parse import quote
-from .serper_search import SerperEvidenceRetriever
+from .serper_search import EVIDENCE_MODES, SerperEvidenceRetriever, afetch_document
 from google.ai.generativelanguage_v1beta.types import content
+from core import llm_registry
 import time
-from routes.news_summ import get_news
+from .news_summ import extract_article, lookup_article, store_article
 from urllib.parse import urlparse
-import threading
-import concurrent.futures
+import asyncio
+from .async_utils import run_sync
+from .cache import TieredCache, content_key
+from .evidence_packer import pack_evidence
+from .singleflight import SingleFlight
+from .tracing import span, start_trace
+from .workers import run_in_parse_pool
 
 dotenv.load_dotenv()
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+# Finished reports are cached by a hash of the normalized claim text
+REPORT_CACHE_TTL = int(os.getenv("FC_REPORT_CACHE_TTL", 6 * 60 * 60))
+REPORT_CACHE_SIZE = int(os.getenv("FC_REPORT_CACHE_SIZE", 256))
 
-@dataclass
-class Claim:
-    statement: str
-    confidence_score: int
-    verified_status: str
-    key_evidence: List[str]
-    sources: List[str]
-    worthiness_score: int
+# Credibility ratings are stable per domain, so they are cached for a long time
+DOMAIN_CREDIBILITY_TTL = int(os.getenv("FC_DOMAIN_CREDIBILITY_TTL", 7 * 24 * 60 * 60))
 
-class FactChecker:
-    def __init__(self, groq_api_key: str, serper_api_key: str):
-        generation_config = {
-        "temperature": 1,
-        "top_p": 0.95,
-        "top_k": 40,
-        "max_output_tokens": 8192,
-        "response_schema": content.Schema(
+# Search the raw claim in parallel with question generation
+SPECULATIVE_SEARCH = os.getenv("FC_SPECULATIVE_SEARCH", "1") == "1"
+SPECULATIVE_QUERY_WORDS = int(os.getenv("FC_SPECULATIVE_QUERY_WORDS", 32))
+
+# Default evidence depth for callers that do not pick one (see serper_search.EVIDENCE_MODES)
+EVIDENCE_MODE = os.getenv("FC_EVIDENCE_MODE", "thorough")
+
+# Evidence pages summarized at once, and the deadline for each one
+EVIDENCE_CONCURRENCY = int(os.getenv("FC_EVIDENCE_CONCURRENCY", 8))
+EVIDENCE_URL_TIMEOUT = float(os.getenv("FC_EVIDENCE_URL_TIMEOUT", 10))
+
+REPORT_GENERATION_CONFIG = {
+    "temperature": 1,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+    "response_schema": content.Schema(
+        type = content.Type.OBJECT,
+        enum = [],
+        required = ["overall_analysis", "claim_analysis"],
+        properties = {
+        "overall_analysis": content.Schema(
             type = content.Type.OBJECT,
             enum = [],
-            required = ["overall_analysis", "claim_analysis"],
+            required = ["truth_score", "reliability_assessment", "key_findings"],
+            properties = {
+            "truth_score": content.Schema(
+                type = content.Type.NUMBER,
+            ),
+            "reliability_assessment": content.Schema(
+                type = content.Type.STRING,
+            ),
+            "key_findings": content.Schema(
+                type = content.Type.ARRAY,
+                items = content.Schema(
+                type = content.Type.STRING,
+                ),
+            )
+            },
+        ),
+        "claim_analysis": content.Schema(
+            type = content.Type.ARRAY,
+            items = content.Schema(
+            type = content.Type.OBJECT,
+            required = ["claim", "verification_status", "confidence_level", "misinformation_impact"],
             properties = {
-            "overall_analysis": content.Schema(
+                "claim": content.Schema(
+                type = content.Type.STRING,
+                ),
+                "verification_status": content.Schema(
+                type = content.Type.STRING,
+                ),
+                "confidence_level": content.Schema(
+                type = content.Type.NUMBER,
+                ),                    
+                "misinformation_impact": content.Schema(
                 type = content.Type.OBJECT,
-                enum = [],
-                required = ["truth_score", "reliability_assessment", "key_findings"],
+                required = ["severity", "affected_domains", "potential_consequences", "spread_risk"],
                 properties = {
-                "truth_score": content.Schema(
+                    "severity": content.Schema(
                     type = content.Type.NUMBER,
-                ),
-                "reliability_assessment": content.Schema(
-                    type = content.Type.STRING,
-                ),
-                "key_findings": content.Schema(
+                    ),
+                    "affected_domains": content.Schema(
                     type = content.Type.ARRAY,
                     items = content.Schema(
-                    type = content.Type.STRING,
+                        type = content.Type.STRING,
                     ),
-                )
-                },
-            ),
-            "claim_analysis": content.Schema(
-                type = content.Type.ARRAY,
-                items = content.Schema(
-                type = content.Type.OBJECT,
-                required = ["claim", "verification_status", "confidence_level", "misinformation_impact"],
-                properties = {
-                    "claim": content.Schema(
-                    type = content.Type.STRING,
                     ),
-                    "verification_status": content.Schema(
-                    type = content.Type.STRING,
+                    "potential_consequences": content.Schema(
+                    type = content.Type.ARRAY,
+                    items = content.Schema(
+                        type = content.Type.STRING,
+                    ),
                     ),
-                    "confidence_level": content.Schema(
+                    "spread_risk": content.Schema(
                     type = content.Type.NUMBER,
-                    ),                    
-                    "misinformation_impact": content.Schema(
-                    type = content.Type.OBJECT,
-                    required = ["severity", "affected_domains", "potential_consequences", "spread_risk"],
-                    properties = {
-                        "severity": content.Schema(
-                        type = content.Type.NUMBER,
-                        ),
-                        "affected_domains": content.Schema(
-                        type = content.Type.ARRAY,
-                        items = content.Schema(
-                            type = content.Type.STRING,
-                        ),
-                        ),
-                        "potential_consequences": content.Schema(
-                        type = content.Type.ARRAY,
-                        items = content.Schema(
-                            type = content.Type.STRING,
-                        ),
-                        ),
-                        "spread_risk": content.Schema(
-                        type = content.Type.NUMBER,
-                        ),
-                    },
                     ),
                 },
                 ),
-            ),
             },
+            ),
         ),
-        "response_mime_type": "application/json",
-        }
+        },
+    ),
+    "response_mime_type": "application/json",
+}
 
-        generation_config_sources = {
-        "temperature": 1,
-        "top_p": 0.95,
-        "top_k": 40,
-        "max_output_tokens": 8192,
-        "response_schema": content.Schema(
-            type = content.Type.ARRAY,
-            items = content.Schema(
+SOURCES_GENERATION_CONFIG = {
+    "temperature": 1,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+    "response_schema": content.Schema(
+        type = content.Type.ARRAY,
+        items = content.Schema(
+        type = content.Type.OBJECT,
+        required = ["source", "credibility_score", "fact_checking_history", "transparency_score", "expertise_level", "additional_metrics"],
+        properties = {
+        "source": content.Schema(
+            type = content.Type.STRING,
+        ),
+        "credibility_score": content.Schema(
+            type = content.Type.INTEGER,
+        ),
+        "fact_checking_history": content.Schema(
+            type = content.Type.INTEGER,
+        ),
+        "transparency_score": content.Schema(
+            type = content.Type.INTEGER,
+        ),
+        "expertise_level": content.Schema(
+            type = content.Type.INTEGER,
+        ),
+        "additional_metrics": content.Schema(
             type = content.Type.OBJECT,
-            required = ["source", "credibility_score", "fact_checking_history", "transparency_score", "expertise_level", "additional_metrics"],
             properties = {
-            "source": content.Schema(
-                type = content.Type.STRING,
-            ),
-            "credibility_score": content.Schema(
-                type = content.Type.INTEGER,
-            ),
-            "fact_checking_history": content.Schema(
-                type = content.Type.INTEGER,
-            ),
-            "transparency_score": content.Schema(
+            "citation_score": content.Schema(
                 type = content.Type.INTEGER,
             ),
-            "expertise_level": content.Schema(
+            "peer_recognition": content.Schema(
                 type = content.Type.INTEGER,
             ),
-            "additional_metrics": content.Schema(
-                type = content.Type.OBJECT,
-                properties = {
-                "citation_score": content.Schema(
-                    type = content.Type.INTEGER,
-                ),
-                "peer_recognition": content.Schema(
-                    type = content.Type.INTEGER,
-                ),
-                },
+            },
+        ),
+        }),
+    ),
+    "response_mime_type": "application/json",
+}
+
+QUESTIONS_GENERATION_CONFIG = {
+    "temperature": 1,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+    "response_schema": content.Schema(
+        type = content.Type.OBJECT,
+        enum = [],
+        required = ["questions"],
+        properties = {
+        "questions": content.Schema(
+            type = content.Type.ARRAY,
+            items = content.Schema(
+            type = content.Type.STRING,
             ),
-            }),
         ),
-        "response_mime_type": "application/json",
-        }
+        },
+    ),
+    "response_mime_type": "application/json",
+}
+
+llm_registry.register_model("fc_report", "gemini-flash-latest", REPORT_GENERATION_CONFIG)
+llm_registry.register_model("fc_sources", "gemini-2.0-flash", SOURCES_GENERATION_CONFIG)
+llm_registry.register_model("fc_questions", "gemini-2.0-flash", QUESTIONS_GENERATION_CONFIG)
+
+def _rating_domain(source) -> str:
+    """The domain a credibility rating names in its "source" field, normalized like the prompt domains"""
+    source = str(source or "").strip().lower()
+    if "://" in source:
+        source = urlparse(source).netloc
+    source = source.split("/", 1)[0]
+    return source[4:] if source.startswith("www.") else source
 
 
+def match_source_ratings(domains: List[str], source_ratings) -> Dict[str, Dict]:
+    """Pair the credibility ratings Gemini returned with the domains they rate
+
+    Ratings are matched by their "source" field, never by position, since the
+    model may drop, reorder or repeat items. A domain is only paired when
+    exactly one rating names it; the rest are left unrated.
+
+    Args:
+        domains: the domains sent in the prompt.
+        source_ratings: the parsed JSON answer, a list of rating objects.
+
+    Returns:
+        dict: rating per domain, for the domains matched unambiguously.
+    """
+    by_key = {}
+    for domain in domains:
+        by_key.setdefault(_rating_domain(domain), []).append(domain)
+
+    matches = {}
+    for rating in source_ratings if isinstance(source_ratings, list) else []:
+        if not isinstance(rating, dict):
+            continue
+        candidates = by_key.get(_rating_domain(rating.get("source")), [])
+        if len(candidates) == 1:
+            matches.setdefault(candidates[0], []).append(rating)
+    return {domain: ratings[0] for domain, ratings in matches.items() if len(ratings) == 1}
+
+@dataclass
+class Claim:
+    statement: str
+    confidence_score: int
+    verified_status: str
+    key_evidence: List[str]
+    sources: List[str]
+    worthiness_score: int
+
+class FactChecker:
+    def __init__(self, groq_api_key: str, serper_api_key: str):
         #############################################################
         self.client = Groq(api_key=groq_api_key)
         self.search_client = SerperEvidenceRetriever(api_key=serper_api_key)
+        self.report_cache = TieredCache("reports", ttl=REPORT_CACHE_TTL, max_entries=REPORT_CACHE_SIZE)
+        self.report_flight = SingleFlight("reports")
+        # The speculative cache warming and the report's evidence stage share summaries of a page
+        self.summary_flight = SingleFlight("summaries")
+        self.domain_cache = TieredCache("domain_credibility", ttl=DOMAIN_CREDIBILITY_TTL, max_entries=2048)
         
         #############################################################
-        self.gemini_client = genai.GenerativeModel(
-            model_name="gemini-flash-latest",
-            generation_config=generation_config,
-        )
-        self.gemini_chat = self.gemini_client.start_chat(
-            history=[]
-        )
+        self.gemini_client = llm_registry.get_model("fc_report")
         
         #############################################################
-        self.source_correction = genai.GenerativeModel(
-            model_name="gemini-2.0-flash",
-            generation_config=generation_config_sources,
-        )
-        self.gemini_chat_sources = self.source_correction.start_chat(
-            history=[]
-        )
+        self.source_correction = llm_registry.get_model("fc_sources")
+        # All Gemini calls are stateless generate_content requests: a shared chat
+        # session would grow its history (and prompt) with every report
     
     def generate_verification_questions(self, claim: str) -> List[str]:
         # prompt = {
@@ -187,68 +264,32 @@ class FactChecker:
         
         gemini_questions_prompt = f"Generate specific questions to verify this claim. Make a maximum of 3 questions for the claim. Return as JSON array:\n\n{claim}"
 
-        generation_config_questions = {
-        "temperature": 1,
-        "top_p": 0.95,
-        "top_k": 40,
-        "max_output_tokens": 8192,
-        "response_schema": content.Schema(
-            type = content.Type.OBJECT,
-            enum = [],
-            required = ["questions"],
-            properties = {
-            "questions": content.Schema(
-                type = content.Type.ARRAY,
-                items = content.Schema(
-                type = content.Type.STRING,
-                ),
-            ),
-            },
-        ),
-        "response_mime_type": "application/json",
-        }
+        response = llm_registry.get_model("fc_questions").generate_content(gemini_questions_prompt)
 
-        model_questions = genai.GenerativeModel(
-            model_name="gemini-2.0-flash",
-            generation_config=generation_config_questions,
-        )
-
-        chat_session_questions = model_questions.start_chat(
-        history=[
-        ]
-        )
 
-        response = chat_session_questions.send_message(gemini_questions_prompt)
+        return json.loads(response.text)
 
+    async def agenerate_verification_questions(self, claim: str) -> List[str]:
+        """Awaitable variant of generate_verification_questions"""
+        gemini_questions_prompt = f"Generate specific questions to verify this claim. Make a maximum of 3 questions for the claim. Return as JSON array:\n\n{claim}"
 
-        return json.loads(response.text)
+        with span("questions") as stage:
+            response = await llm_registry.get_model("fc_questions").generate_content_async(gemini_questions_prompt)
+            questions = json.loads(response.text)
+            stage.set(questions=len(questions.get("questions", [])) if isinstance(questions, dict) else len(questions))
+        return questions
 
     def search_evidence(self, query: str) -> List[Dict]:
         return self.search_client.retrieve_evidence(query)
 
-    def analyze_source_credibility(self, sources):
-        """
-        Analyze the credibility of news sources using Gemini
-        
-        Args:
-            sources: List of source URLs to analyze
-            
-        Returns:
-            Dictionary containing source credibility analysis
-        """
-        if not sources:
-            return []
-        
-        # Extract domain names from URLs for better analysis
-        domains = [urlparse(source).netloc for source in sources]
-        
+    def _source_analysis_prompt(self, domains):
         # Create a prompt that asks Gemini to evaluate the sources
-        source_analysis_prompt = f"""
+        return f"""
         Analyze the credibility of these news sources:
         
-        {domains}
+        {chr(10).join(domains)}
         
-        For each source, evaluate:
+        For each source, set "source" to the domain exactly as listed above, and evaluate:
         1. Credibility score (1-100)
         2. Fact-checking history (1-100)
         3. Transparency score (1-100)
@@ -260,28 +301,68 @@ class FactChecker:
         
         Return the analysis as a structured JSON array with one object per source.
         """
+
+    def analyze_source_credibility(self, sources):
+        """
+        Analyze the credibility of news sources using Gemini
         
-        # Use the gemini_chat_sources which has the appropriate schema configuration
-        response = self.gemini_chat_sources.send_message(source_analysis_prompt)
-        
-        try:
-            source_ratings = json.loads(response.text)
-            
-            # Map the domain analysis back to the original URLs
-            result = []
-            for i, url in enumerate(sources):
-                if i < len(source_ratings):
-                    rating = source_ratings[i]
-                    rating['url'] = url
-                    result.append(rating)
+        Args:
+            sources: List of source URLs to analyze
             
-            return result
-        except Exception as e:
-            print(f"Error parsing source credibility analysis: {str(e)}")
+        Returns:
+            Dictionary containing source credibility analysis
+        """
+        return run_sync(self.aanalyze_source_credibility(sources))
+
+    async def aanalyze_source_credibility(self, sources):
+        """Awaitable variant of analyze_source_credibility
+
+        Domains rated before are answered from the domain credibility cache; only
+        unseen or expired domains are sent to Gemini, in a single request. The
+        ratings are returned in source order, one per source URL.
+        """
+        if not sources:
             return []
+        
+        # Extract domain names from URLs for better analysis
+        domains = [urlparse(source).netloc.lower() for source in sources]
+        ratings = {domain: self.domain_cache.get(domain) for domain in dict.fromkeys(domains)}
+        unseen_domains = [domain for domain, rating in ratings.items() if rating is None]
+
+        if unseen_domains:
+            # Use the source_correction model which has the appropriate schema configuration
+            response = await self.source_correction.generate_content_async(self._source_analysis_prompt(unseen_domains))
+            try:
+                source_ratings = json.loads(response.text)
+            except Exception as e:
+                print(f"Error parsing source credibility analysis: {str(e)}")
+                source_ratings = []
+            # Only ratings that name their domain unambiguously are kept, and cached
+            for domain, rating in match_source_ratings(unseen_domains, source_ratings).items():
+                rating.pop('url', None)
+                ratings[domain] = rating
+                self.domain_cache.set(domain, rating)
+            unmatched = [domain for domain in unseen_domains if ratings.get(domain) is None]
+            if unmatched:
+                print(f"No unambiguous credibility rating for {unmatched}, not caching them")
+
+        # Map the domain analysis back to the original URLs
+        result = []
+        for url, domain in zip(sources, domains):
+            if ratings.get(domain) is not None:
+                result.append({**ratings[domain], 'url': url})
+        
+        return result
+
+    async def _agenerate_enhanced_report(self, news_summ, evidences):
+        """Generate the structured fact-check report for the claim and its evidence
 
-    def _generate_enhanced_report(self, news_summ, evidences, result_dict):
-        """Helper method to generate enhanced report in a separate thread"""
+        Only the most relevant, non-duplicate evidence that fits
+        FC_EVIDENCE_TOKEN_BUDGET is put in the prompt (see evidence_packer).
+        """
+        with span("pack_evidence", passages=len(evidences)) as stage:
+            evidences = pack_evidence(news_summ, evidences)
+            stage.set(kept=len(evidences), chars=sum(len(evidence) for evidence in evidences))
         report_prompt = f"""Generate a comprehensive fact-check analysis report for this news claim and supporting evidence. Structure your analysis according to these sections:
 
         1. Overall Analysis:
@@ -303,15 +384,173 @@ class FactChecker:
         Please provide numerical scores where applicable and cite specific evidence examples to support your analysis.
         """
                     
-        enhanced_report = self.gemini_client.generate_content(report_prompt)
-        result_dict['detailed_analysis'] = json.loads(enhanced_report.text)
+        with span("report_llm", prompt_chars=len(report_prompt)) as stage:
+            enhanced_report = await self.gemini_client.generate_content_async(report_prompt)
+            stage.set(response_chars=len(enhanced_report.text))
+        return json.loads(enhanced_report.text)
 
-    def _analyze_sources_credibility(self, sources, result_dict):
-        """Helper method to analyze source credibility in a separate thread"""
-        source_credibility = self.analyze_source_credibility(sources[:5])  # Analyze top 5 sources
-        result_dict['source_credibility'] = source_credibility
-    
-    def generate_report(self, news_summ: str) -> Dict:
+    async def _asummarize_evidence(self, url: str) -> Dict:
+        """Summarize an evidence page, reusing the copy fetched for snippet extension"""
+        cached = lookup_article(url)
+        if cached is not None:
+            return cached
+        # Concurrent summaries of the same page share one run
+        summary, _ = await self.summary_flight.do(url, lambda: self._asummarize_page(url))
+        return summary
+
+    async def _asummarize_page(self, url: str) -> Dict:
+        document = await afetch_document(url)
+        if document is None:
+            return store_article(url, {'status': 'error', 'message': f'Could not fetch {url}'})
+        # newspaper3k parsing and nlp() are CPU bound, run them in the parse pool
+        return store_article(url, await run_in_parse_pool(extract_article, url, document.text))
+
+    async def _acollect_evidence(self, evidence_dict, mode: str = "thorough", stage_name: str = "collect_evidence"):
+        """Summarize every evidence page concurrently, keeping the original evidence order
+
+        At most EVIDENCE_CONCURRENCY pages are processed at once and each one gets
+        EVIDENCE_URL_TIMEOUT seconds, so a single slow site cannot hold up the report.
+        In "fast" mode no page is summarized and the search snippets are the
+        evidence; in "adaptive" mode only evidence that was crawled is.
+        The work is traced as stage_name, so the speculative pass is reported
+        apart from the report's own evidence stage.
+
+        Returns:
+            (evidences, sources): the summaries and the URLs they came from.
+        """
+        with span(stage_name, mode=mode) as stage:
+            evidences, sources = await self._acollect_evidence_items(evidence_dict, mode)
+            stage.set(items=sum(len(evidence) for evidence in evidence_dict.values()), kept=len(evidences))
+        return evidences, sources
+
+    async def _acollect_evidence_items(self, evidence_dict, mode: str):
+        evidence_items = [item for evidence in evidence_dict.values() for item in evidence]
+        semaphore = asyncio.Semaphore(EVIDENCE_CONCURRENCY)
+
+        async def summarize(item):
+            if mode == "fast" or (mode == "adaptive" and not item.get("extended")):
+                return {'status': 'success', 'summary': item['text']}
+            url = item['url']
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self._asummarize_evidence(url), EVIDENCE_URL_TIMEOUT)
+                except asyncio.TimeoutError:
+                    return {'status': 'error', 'message': f'Timed out summarizing {url}'}
+                except Exception as e:
+                    return {'status': 'error', 'message': str(e)}
+
+        results = await asyncio.gather(*(summarize(item) for item in evidence_items))
+
+        evidences = []
+        sources = []
+        for evidence_item, ev_news in zip(evidence_items, results):
+            if (ev_news["status"] == "success"):
+                evidences.append(ev_news["summary"])
+                # The answer box is evidence but not a source with a domain to rate
+                if evidence_item['url'].startswith("http"):
+                    sources.append(evidence_item['url'])
+        return evidences, sources
+
+    async def _aspeculative_evidence(self, news_summ: str, mode: str = "thorough"):
+        """Search the claim itself and start warming the article cache with its results
+
+        Runs concurrently with question generation. Failures only cost the
+        speculative evidence, never the report.
+
+        Returns:
+            (evidence_dict, warm_task): the evidence, as soon as the search is
+                done, and the task summarizing it in the background (None if
+                the search failed). The caller owns the task and cancels it
+                once the report no longer needs it.
+        """
+        try:
+            with span("speculative_search"):
+                evidence_dict = await self.search_client.aretrieve_evidence(
+                    claim_queries_dict={news_summ: [self._speculative_query(news_summ)]}, mode=mode
+                )
+        except Exception as e:
+            print(f"Speculative search failed: {str(e)}")
+            return {}, None
+        # Summaries land in the article cache, and the final evidence stage joins the ones still running
+        warm_task = asyncio.create_task(self._awarm_evidence(evidence_dict, mode))
+        return evidence_dict, warm_task
+
+    async def _awarm_evidence(self, evidence_dict: Dict, mode: str):
+        try:
+            await self._acollect_evidence(evidence_dict, mode=mode, stage_name="speculative_collect_evidence")
+        except Exception as e:
+            print(f"Speculative evidence collection failed: {str(e)}")
+
+    @staticmethod
+    def _speculative_query(news_summ: str) -> str:
+        # Long article summaries make poor search queries; keep the leading words
+        return " ".join(news_summ.split()[:SPECULATIVE_QUERY_WORDS])
+
+    @staticmethod
+    def _merge_evidence(evidence_dict: Dict, extra_evidence_dict: Dict) -> Dict:
+        """Append extra evidence per claim, skipping items whose URL (or answer text) is already present"""
+        merged = {claim: list(evidence) for claim, evidence in evidence_dict.items()}
+        for claim, extra_evidence in extra_evidence_dict.items():
+            evidence = merged.setdefault(claim, [])
+            seen = {item['url'] if item['url'] != "Google Answer Box" else item['text'] for item in evidence}
+            for item in extra_evidence:
+                key = item['url'] if item['url'] != "Google Answer Box" else item['text']
+                if key not in seen:
+                    seen.add(key)
+                    evidence.append(item)
+        return merged
+
+    async def _atraced_source_credibility(self, sources):
+        with span("source_credibility", sources=len(sources)):
+            return await self.aanalyze_source_credibility(sources)
+
+    def generate_report(self, news_summ: str, mode: str = None) -> Dict:
+        """Blocking wrapper of agenerate_report for standalone scripts
+
+        Runs on run_sync's background loop, so it can be called repeatedly. The
+        shared async Gemini clients stay bound to the loop that first used them,
+        so the server (routes, scheduled jobs) awaits agenerate_report instead.
+        """
+        return run_sync(self.agenerate_report(news_summ, mode=mode))
+
+    async def agenerate_report(self, news_summ: str, mode: str = None) -> Dict:
+        """Fact-check a claim, answering repeated claims from the report cache.
+
+        Concurrent calls for the same claim share one pipeline run. The returned
+        report carries a cache_status of "hit", "coalesced" or "miss". Every call
+        is recorded as a "generate_report" trace (see fc.tracing).
+
+        Args:
+            news_summ: the claim or article summary to check.
+            mode: evidence depth ("fast", "adaptive" or "thorough"), FC_EVIDENCE_MODE by default.
+        """
+        mode = mode or EVIDENCE_MODE
+        if mode not in EVIDENCE_MODES:
+            raise ValueError(f"Unknown evidence mode {mode!r}, expected one of {EVIDENCE_MODES}")
+
+        with start_trace("generate_report", mode=mode, claim_chars=len(news_summ)) as trace:
+            # Reports of different depths are cached separately
+            cache_key = content_key(news_summ, mode)
+            cached_report = self.report_cache.get(cache_key)
+            if cached_report is not None:
+                trace.set(cache_status="hit")
+                return {**cached_report, "cache_status": "hit"}
+
+            report, shared = await self.report_flight.do(
+                cache_key, lambda: self._arun_and_cache(news_summ, cache_key, mode)
+            )
+            cache_status = "coalesced" if shared else "miss"
+            trace.set(cache_status=cache_status)
+            return {**report, "cache_status": cache_status}
+
+    async def _arun_and_cache(self, news_summ: str, cache_key: str, mode: str) -> Dict:
+        report = await self._arun_pipeline(news_summ, mode)
+        # Only cache complete reports so a transient Gemini failure is retried next time
+        if report["detailed_analysis"]:
+            self.report_cache.set(cache_key, report)
+        return report
+
+    async def _arun_pipeline(self, news_summ: str, mode: str = "thorough") -> Dict:
         ### FUTURE PROSPECT ###
         # # Source credibility analysis
         # source_ratings = {}
@@ -334,44 +573,44 @@ class FactChecker:
         # time.sleep(60)
         ### FUTURE PROSPECT ###
         
-        verif_ques = self.generate_verification_questions(news_summ)["questions"]
-        
-        # retrieve evidences for each question from the search client
-        claim_queries_dict = {news_summ: [q for q in verif_ques]}
-        
-        evidence_dict = self.search_client.retrieve_evidence(claim_queries_dict=claim_queries_dict)
-        
-        # Collect evidence for each question
-        evidences = []
-        sources = []
-        for claim, evidence in evidence_dict.items():
-            for evidence_item in evidence:
-                ev_news = get_news(evidence_item['url'])
-                if (ev_news["status"] == "success"):
-                    evidences.append(ev_news["summary"])
-                    sources.append(evidence_item['url'])
-        
-        # Use a dictionary to store results from threads
-        thread_results = {}
-        
-        # Create threads for parallel execution
-        report_thread = threading.Thread(
-            target=self._generate_enhanced_report,
-            args=(news_summ, evidences, thread_results)
-        )
+        # Speculatively search (and summarize) the raw claim while Gemini writes the questions
+        speculative_task = None
+        warm_task = None
+        if SPECULATIVE_SEARCH and mode != "fast":
+            speculative_task = asyncio.create_task(self._aspeculative_evidence(news_summ, mode))
+
+        try:
+            verif_ques = (await self.agenerate_verification_questions(news_summ))["questions"]
+            
+            # retrieve evidences for each question from the search client
+            claim_queries_dict = {news_summ: [q for q in verif_ques]}
+            
+            with span("evidence_search", queries=len(verif_ques)):
+                evidence_dict = await self.search_client.aretrieve_evidence(claim_queries_dict=claim_queries_dict, mode=mode)
+            if speculative_task is not None:
+                speculative_evidence, warm_task = await speculative_task
+                evidence_dict = self._merge_evidence(evidence_dict, speculative_evidence)
+            
+            # Collect evidence for each question
+            evidences, sources = await self._acollect_evidence(evidence_dict, mode=mode)
+        finally:
+            # On failure or cancellation the speculative work must not outlive the report
+            for task in (speculative_task, warm_task):
+                if task is not None and not task.done():
+                    task.cancel()
         
-        source_thread = threading.Thread(
-            target=self._analyze_sources_credibility,
-            args=(sources, thread_results)
+        # Run the report and the source credibility analysis concurrently
+        detailed_analysis, source_credibility = await asyncio.gather(
+            self._agenerate_enhanced_report(news_summ, evidences),
+            self._atraced_source_credibility(sources[:5]),  # Analyze top 5 sources
+            return_exceptions=True,
         )
-        
-        # Start both threads
-        report_thread.start()
-        source_thread.start()
-        
-        # Wait for both threads to complete
-        report_thread.join()
-        source_thread.join()
+        if isinstance(detailed_analysis, Exception):
+            print(f"Error generating enhanced report: {str(detailed_analysis)}")
+            detailed_analysis = {}
+        if isinstance(source_credibility, Exception):
+            print(f"Error analyzing source credibility: {str(source_credibility)}")
+            source_credibility = []
 
         ### FUTURE PROSPECT ###
         # Source Ratings: {json.dumps(source_ratings)}
@@ -388,10 +627,10 @@ class FactChecker:
         return {
             "timestamp": datetime.now().isoformat(),
             "original_text": news_summ,
-            "detailed_analysis": thread_results.get('detailed_analysis', {}),
+            "detailed_analysis": detailed_analysis,
             "sources": sources[:5],
-            "source_credibility": thread_results.get('source_credibility', [])
+            "source_credibility": source_credibility
         }
             ### FUTURE PROSPECT ###
             # "correction_sources": correction_sources
-            ### FUTURE PROSPECT ###
\ No newline at end of file
+            ### FUTURE PROSPECT ###
@@ -0,0 +1,269 @@
+import asyncio
+import ipaddress
+import os
+import socket
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from core.metrics import observe_call
+
+from .crawler import crawler
+
+# Jobs submitted through POST /jobs run at most this many at once, and at most FC_JOB_QUEUE_SIZE
+# wait for a worker before submissions are refused. The blocking fact-check routes
+# (/get-fc-text, /get-fc-url, /fact-check-selected-news) do not go through this pool.
+JOB_WORKERS = int(os.getenv("FC_JOB_WORKERS", 4))
+JOB_QUEUE_SIZE = int(os.getenv("FC_JOB_QUEUE_SIZE", 100))
+# Finished jobs stay pollable for this long (and at most FC_JOB_RETAINED of them are kept)
+JOB_TTL = int(os.getenv("FC_JOB_TTL", 60 * 60))
+JOB_RETAINED = int(os.getenv("FC_JOB_RETAINED", 1000))
+WEBHOOK_TIMEOUT = float(os.getenv("FC_WEBHOOK_TIMEOUT", 10))
+# Webhooks may only reach public addresses unless this is set (for local development)
+WEBHOOK_ALLOW_PRIVATE = os.getenv("FC_WEBHOOK_ALLOW_PRIVATE", "0") == "1"
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class QueueFull(Exception):
+    """The job queue is at FC_JOB_QUEUE_SIZE; the caller should retry later"""
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def check_webhook_url(url: str) -> str:
+    """Make sure a client-supplied webhook URL cannot point the server at internal services
+
+    Only http and https URLs are accepted, and every address the host resolves
+    to must be public: loopback, private, link-local (e.g. cloud metadata) and
+    reserved addresses are refused. FC_WEBHOOK_ALLOW_PRIVATE=1 lifts the
+    address check for local development.
+
+    Args:
+        url: the webhook URL.
+
+    Returns:
+        str: the URL, unchanged.
+
+    Raises:
+        ValueError: if the URL is not acceptable.
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        raise ValueError("webhook_url is not a valid URL")
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("webhook_url must be an http or https URL")
+    if WEBHOOK_ALLOW_PRIVATE:
+        return url
+
+    try:
+        addresses = await asyncio.get_running_loop().getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError):
+        raise ValueError(f"webhook_url host {parts.hostname!r} does not resolve")
+    if not addresses or not all(_is_public_address(address[4][0]) for address in addresses):
+        raise ValueError(f"webhook_url host {parts.hostname!r} is not a public address")
+    return url
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: Any
+    webhook_url: Optional[str] = None
+    status: str = "queued"
+    result: Any = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobManager:
+    """Runs fact-check jobs on a bounded pool of asyncio workers.
+
+    Jobs wait in a queue of at most FC_JOB_QUEUE_SIZE and are run by
+    FC_JOB_WORKERS workers; a full queue refuses new jobs (QueueFull) instead
+    of letting work pile up. Each job kind has a registered handler, an async
+    function of the job payload. Finished jobs can be polled for FC_JOB_TTL
+    seconds, and a job submitted with a webhook_url has its final state POSTed
+    there.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_size: int = JOB_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._handlers: Dict[str, Callable[[Any], Awaitable[Any]]] = {}
+        self._validators: Dict[str, Callable[[Any], Any]] = {}
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._webhooks = set()
+        self.running = 0
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def register(self, kind: str, handler: Callable[[Any], Awaitable[Any]], validator: Callable[[Any], Any] = None):
+        """Declare a job kind
+
+        Args:
+            kind: the name clients submit jobs under, e.g. "fc-text".
+            handler: async function of the payload returning the job result.
+            validator: turns a raw (JSON) payload into the handler's input, raising if it is invalid.
+        """
+        self._handlers[kind] = handler
+        if validator is not None:
+            self._validators[kind] = validator
+
+    def kinds(self):
+        return sorted(self._handlers)
+
+    def validate(self, kind: str, payload: Any) -> Any:
+        """The handler input for a raw payload (the payload itself if the kind has no validator)"""
+        if kind not in self._handlers:
+            raise KeyError(kind)
+        validator = self._validators.get(kind)
+        return validator(payload) if validator is not None else payload
+
+    async def start(self):
+        """Start the workers on the running loop (the app lifespan does this at startup)"""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers; jobs still queued or running are marked failed"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        for job in self._jobs.values():
+            if job.status == "queued":
+                self._finish(job, error=RuntimeError("Server shutting down"))
+        await asyncio.gather(*self._webhooks, return_exceptions=True)
+
+    async def submit(self, kind: str, payload: Any, webhook_url: Optional[str] = None) -> Job:
+        """Queue a job and return it without waiting for it to run
+
+        Raises:
+            KeyError: for an unregistered kind.
+            QueueFull: if FC_JOB_QUEUE_SIZE jobs are already waiting.
+        """
+        if kind not in self._handlers:
+            raise KeyError(kind)
+        await self.start()
+        self._prune()
+        job = Job(id=uuid.uuid4().hex, kind=kind, payload=payload, webhook_url=webhook_url)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFull(f"{self.queue_size} jobs are already queued")
+        self._jobs[job.id] = job
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                job.status = "running"
+                job.started_at = datetime.now()
+                self.running += 1
+                try:
+                    result = await self._handlers[job.kind](job.payload)
+                except asyncio.CancelledError:
+                    self._finish(job, error=RuntimeError("Server shutting down"))
+                    raise
+                except Exception as e:
+                    self._finish(job, error=e)
+                else:
+                    self._finish(job, result=result)
+                finally:
+                    self.running -= 1
+            finally:
+                self._queue.task_done()
+
+    def _finish(self, job: Job, result: Any = None, error: Optional[BaseException] = None):
+        job.finished_at = datetime.now()
+        if error is None:
+            job.status = "succeeded"
+            job.result = result
+            self.succeeded += 1
+        else:
+            job.status = "failed"
+            # HTTPException carries its message in detail
+            job.error = str(getattr(error, "detail", None) or error)
+            self.failed += 1
+        if job.webhook_url:
+            task = asyncio.get_running_loop().create_task(self._send_webhook(job))
+            self._webhooks.add(task)
+            task.add_done_callback(self._webhooks.discard)
+
+    async def _send_webhook(self, job: Job):
+        try:
+            # Checked again at delivery, in case the host now resolves elsewhere
+            await check_webhook_url(job.webhook_url)
+            with observe_call("webhook", job.kind):
+                # A redirect could point anywhere, so it is not followed
+                response = await crawler.post(
+                    job.webhook_url, json=job.to_dict(), timeout=WEBHOOK_TIMEOUT, follow_redirects=False
+                )
+                response.raise_for_status()
+        except Exception as e:
+            print(f"Webhook for job {job.id} to {job.webhook_url} failed: {str(e)}")
+
+    def _prune(self):
+        """Forget finished jobs older than FC_JOB_TTL, and the oldest beyond FC_JOB_RETAINED"""
+        cutoff = time.time() - JOB_TTL
+        for job_id in list(self._jobs):
+            job = self._jobs[job_id]
+            expired = job.finished_at is not None and job.finished_at.timestamp() < cutoff
+            if expired or (len(self._jobs) > JOB_RETAINED and job.finished_at is not None):
+                del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+job_manager = JobManager()
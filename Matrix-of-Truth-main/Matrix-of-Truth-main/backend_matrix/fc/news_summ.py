@@ -1,6 +1,10 @@
 from newspaper import Article
+from newspaper.article import ArticleDownloadState, ArticleException
 import nltk
 import os
+import threading
+from .cache import TieredCache, normalize_url
+from .cassette import cassette
 
 
 nltk_data_dir = "nltk_data"
@@ -8,17 +12,71 @@ nltk.data.path.insert(0, nltk_data_dir)
 
 print(f"Looking for nltk data in: {nltk_data_dir}")
 
-def get_news(url):
+# Extracted articles are cached by URL; failures (dead links, paywalls) only briefly
+ARTICLE_CACHE_TTL = int(os.getenv("FC_ARTICLE_CACHE_TTL", 24 * 60 * 60))
+ARTICLE_ERROR_TTL = int(os.getenv("FC_ARTICLE_ERROR_TTL", 10 * 60))
+ARTICLE_CACHE_SIZE = int(os.getenv("FC_ARTICLE_CACHE_SIZE", 512))
+
+_article_cache = None
+_article_cache_lock = threading.Lock()
+
+
+def get_article_cache() -> TieredCache:
+    # Created lazily so parse-pool workers importing this module do not open the cache
+    global _article_cache
+    with _article_cache_lock:
+        if _article_cache is None:
+            _article_cache = TieredCache("articles", ttl=ARTICLE_CACHE_TTL, max_entries=ARTICLE_CACHE_SIZE)
+        return _article_cache
+
+
+def lookup_article(url):
+    """Return the cached extraction result for url, or None"""
+    return get_article_cache().get(normalize_url(url))
+
+
+def store_article(url, result):
+    """Cache an extraction result, keeping failures for ARTICLE_ERROR_TTL only"""
+    ttl = ARTICLE_CACHE_TTL if result.get('status') == 'success' else ARTICLE_ERROR_TTL
+    get_article_cache().set(normalize_url(url), result, ttl=ttl)
+    return result
+
+
+def download_html(url):
+    """Download a page with newspaper, raising if the download fails"""
+    article = Article(url)
+    article.download()
+    if article.download_state != ArticleDownloadState.SUCCESS:
+        raise ArticleException(article.download_exception_msg)
+    return article.html
+
+
+def extract_article(url, html=None):
+    """Download (unless html is given), parse and summarize a news article, without caching
+
+    Args:
+        url: the article URL.
+        html: the already fetched page, to parse without downloading it again.
+    """
     try:
+        if html is None and cassette.active:
+            html = cassette.play("newspaper", url, lambda: download_html(url))
         article = Article(url)
-        article.download()
+        article.download(input_html=html)
         article.parse()
+        if not article.text.strip():
+            # Paywalls and script-rendered pages parse "successfully" but yield no text
+            return {
+                'status': 'error',
+                'message': 'No article text could be extracted'
+            }
         article.nlp()
-        
+
         return {
             'status': 'success',
             'summary': article.summary,
             'title': article.title,
+            'text': article.text,
             'url': url
         }
     except Exception as e:
@@ -26,3 +84,16 @@ def get_news(url):
             'status': 'error',
             'message': str(e)
         }
+
+
+def get_news(url, html=None):
+    """Cached extract_article: title, text and summary of the article at url
+
+    Args:
+        url: the article URL.
+        html: the already fetched page, to parse without downloading it again.
+    """
+    cached = lookup_article(url)
+    if cached is not None:
+        return cached
+    return store_article(url, extract_article(url, html))
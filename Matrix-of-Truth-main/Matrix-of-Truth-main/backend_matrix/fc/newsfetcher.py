@@ -1,10 +1,13 @@
 from newsapi.newsapi_client import NewsApiClient
+import asyncio
 import os
 from dotenv import load_dotenv
+from .async_utils import run_sync
 from .news_summ import get_news
 import uuid
 from db.database_service import DatabaseService
 from factcheck_instance import fact_checker_instance
+from core.metrics import observe_call
 
 load_dotenv(dotenv_path=".env")
 
@@ -16,7 +19,8 @@ class NewsFetcher:
 
     def fetch_initial_news(self):
     # Fetch first batch of 200 news articles
-        news = self.newsapi.get_top_headlines(language='en', page=1, page_size=100)
+        with observe_call("newsapi", "top_headlines"):
+            news = self.newsapi.get_top_headlines(language='en', page=1, page_size=100)
         
         if news['articles']:
             # Store news articles in database with processed=False flag
@@ -27,41 +31,59 @@ class NewsFetcher:
 
         
     def process_single_news(self):
-        news = self.db_service.get_unprocessed_news()
+        """Blocking wrapper of aprocess_single_news for scripts; the server awaits aprocess_single_news"""
+        return run_sync(self.aprocess_single_news())
 
-        if not news:
-            # Pre-fetch new news before clearing database
+    def _refresh_news(self):
+        """Replace the processed news with fresh headlines; True if there are new articles to process"""
+        # Pre-fetch new news before clearing database
+        with observe_call("newsapi", "top_headlines"):
             new_news = self.newsapi.get_top_headlines(language='en', page=1, page_size=100)
-            if new_news['articles']:
-                # Start batch operations
-                batch = self.db_service.db.batch()
-                
-                # Get all processed news
-                old_docs = self.db_service.news_ref.where('processed', '==', True).get()
-                
-                # Delete old news and their factchecks
-                for doc in old_docs:
-                    batch.delete(doc.reference)  # Delete news
-                    batch.delete(self.db_service.factcheck_ref.document(doc.id))  # Delete factcheck
-                
-                # Commit deletions
-                batch.commit()
-                
-                # Store new news
-                self.db_service.store_news(new_news['articles'])
-                # Process first new article immediately
-                return self.process_single_news()
+        if new_news['articles']:
+            # Start batch operations
+            batch = self.db_service.db.batch()
+            
+            # Get all processed news
+            old_docs = self.db_service.news_ref.where('processed', '==', True).get()
+            
+            # Delete old news and their factchecks
+            for doc in old_docs:
+                batch.delete(doc.reference)  # Delete news
+                batch.delete(self.db_service.factcheck_ref.document(doc.id))  # Delete factcheck
             
-            self.fetch_initial_news()
+            # Commit deletions
+            batch.commit()
+            
+            # Store new news
+            self.db_service.store_news(new_news['articles'])
+            return True
+        
+        self.fetch_initial_news()
+        return False
+
+    async def aprocess_single_news(self):
+        """Fact-check the next unprocessed article and store the result.
+
+        The report is awaited on the running loop, which in the server is the
+        one the shared async Gemini clients are bound to; the blocking NewsAPI,
+        Firestore and article download calls run in worker threads.
+        """
+        news = await asyncio.to_thread(self.db_service.get_unprocessed_news)
+
+        if not news:
+            if await asyncio.to_thread(self._refresh_news):
+                # Process first new article immediately
+                return await self.aprocess_single_news()
             return {'status': 'refresh', 'content': 'Refreshing news database'}
         
-        news_text = get_news(news['url'])
+        news_text = await asyncio.to_thread(get_news, news['url'])
         if news_text['status'] == 'error' or len(news_text["summary"]) == 0:
             # remove the news from the database
-            self.db_service.news_ref.document(news['id']).delete()
+            await asyncio.to_thread(self.db_service.news_ref.document(news['id']).delete)
             return { "status": "error", "content": "Error fetching news" }
         
-        fact_check_result = self.fact_checker.generate_report(news_summ=news_text['summary'])
+        # The background news pipeline is not latency bound, so it gathers the deepest evidence
+        fact_check_result = await self.fact_checker.agenerate_report(news_summ=news_text['summary'], mode="thorough")
         
         article_object = {
             "id": str(uuid.uuid4()),
@@ -77,7 +99,7 @@ class NewsFetcher:
             "sources": fact_check_result["sources"]
         }
 
-        self.db_service.store_factcheck(news['id'], article_object)
+        await asyncio.to_thread(self.db_service.store_factcheck, news['id'], article_object)
         return {
             "status": "success",
             "content": article_object,
@@ -5,6 +5,8 @@ import logging
 from google import genai
 from google.genai import types
 from db.database_service import DatabaseService
+from core.metrics import observe_call
+from .cassette import ReplayedText, cassette
 
 logger = logging.getLogger(__name__)
 
@@ -62,10 +64,10 @@ WARNING: [Safety advice from the article]
 URL: [Article URL if available, otherwise search query]
 ---"""
 
-                response = self.client.models.generate_content(
-                    model="gemini-flash-latest",
-                    contents=prompt,
-                    config=config,
+                response = cassette.play(
+                    "gemini", {"model": "scam_alerts", "contents": prompt},
+                    lambda: self._search_scams(prompt, config),
+                    encode=lambda response: response.text, decode=ReplayedText,
                 )
                 
                 if response.text:
@@ -81,6 +83,14 @@ URL: [Article URL if available, otherwise search query]
         
         return categorized_scams
     
+    def _search_scams(self, prompt: str, config):
+        with observe_call("gemini", "scam_alerts"):
+            return self.client.models.generate_content(
+                model="gemini-flash-latest",
+                contents=prompt,
+                config=config,
+            )
+
     def _parse_news_response(self, response_text: str, original_query: str) -> List[Dict[str, Any]]:
         """Parse Gemini's news article response into structured scam data."""
         scams = []
@@ -2,9 +2,32 @@ import json
 import requests
 import bs4
 from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor
-import os
-from web_helper import crawl_web, is_tag_visible
+from .web_helper import crawl_web, is_tag_visible
+from .text_extract import page_text
+from .workers import parse_map
+
+
+def extend_crawled_snippet(html: str, original_snippet: str) -> str:
+    """Extend a search snippet with its context on the crawled page (runs in the parse pool)"""
+    try:
+        text = page_text(html)
+
+        # Find the snippet context
+        snippet_start = text.find(original_snippet[:50])  # Use first 50 chars to find match
+        if snippet_start == -1:
+            return original_snippet
+
+        # Extract extended context
+        pre_context = 0
+        post_context = 500
+        start = max(0, snippet_start - pre_context)
+        end = min(len(text), snippet_start + len(original_snippet) + post_context)
+
+        extended_text = text[start:end].strip()
+        return f"{extended_text}..."
+    except Exception:
+        return original_snippet
+
 
 class SerperSearch:
     def __init__(self, api_key: str):
@@ -89,36 +112,19 @@ class SerperSearch:
         ][:4]
 
     def _process_crawled_content(self, crawl_responses, original_snippets) -> List[str]:
-        def extend_snippet(response, original_snippet, flag):
-            if not flag or not response or '.pdf' in str(response.url):
-                return original_snippet
-            
-            try:
-                soup = bs4.BeautifulSoup(response.text, 'html.parser')
-                text = soup.get_text()
-                
-                # Find the snippet context
-                snippet_start = text.find(original_snippet[:50])  # Use first 50 chars to find match
-                if snippet_start == -1:
-                    return original_snippet
-                
-                # Extract extended context
-                pre_context = 0
-                post_context = 500
-                start = max(0, snippet_start - pre_context)
-                end = min(len(text), snippet_start + len(original_snippet) + post_context)
-                
-                extended_text = text[start:end].strip()
-                return f"{extended_text}..."
-            except Exception:
-                return original_snippet
-
-        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-            extended_snippets = list(executor.map(
-                lambda x: extend_snippet(x[0][1], x[1], x[0][0]),
-                zip(crawl_responses, original_snippets)
-            ))
-            
+        # Parse in the shared process pool; only crawled, non-PDF pages are shipped to it
+        todo = [
+            i for i, (flag, response, *_) in enumerate(crawl_responses)
+            if flag and response and '.pdf' not in str(response.url)
+        ]
+        extended_snippets = list(original_snippets)
+        parsed = parse_map(
+            extend_crawled_snippet,
+            [crawl_responses[i][1].text for i in todo],
+            [original_snippets[i] for i in todo],
+        )
+        for i, extended_snippet in zip(todo, parsed):
+            extended_snippets[i] = extended_snippet
         return extended_snippets
 
     def batch_search(self, queries: List[str], num_results: int = 5) -> Dict[str, List[Dict]]:
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+import threading
+from typing import Dict, List, Tuple
+
+from core.metrics import observe_call
+
+from .cassette import ReplayedResponse, cassette
+from .crawler import crawler
+
+# Overridable so load tests can point the pipeline at a local fixture server
+SERPER_URL = os.getenv("FC_SERPER_URL", "https://google.serper.dev/search")
+# Queries from concurrent reports are collected for this long, or until a batch is full
+SERPER_BATCH_WINDOW = float(os.getenv("FC_SERPER_BATCH_WINDOW_MS", 20)) / 1000
+SERPER_BATCH_SIZE = int(os.getenv("FC_SERPER_BATCH_SIZE", 100))  # Serper accepts up to 100 queries per POST
+
+
+def replay_serper_batch(questions: List[str]) -> ReplayedResponse:
+    """The Serper response to a batch, assembled from the cassette query by query"""
+    return ReplayedResponse([cassette.lookup("serper", question) for question in questions])
+
+
+def record_serper_batch(questions: List[str], response):
+    # Recorded per query, so replay does not depend on how queries were batched
+    for question, result in zip(questions, response.json()):
+        cassette.record("serper", question, result)
+
+
+async def post_serper_batch(api_key: str, questions: List[str]):
+    """POST a batch of queries to Serper through the shared crawler client (or the cassette)
+
+    Args:
+        api_key (str): the Serper API key.
+        questions (list): up to 100 queries.
+
+    Returns:
+        web response: the response from the serper api
+    """
+    headers = {
+        "X-API-KEY": api_key,
+        "Content-Type": "application/json",
+    }
+
+    if cassette.mode == "replay":
+        return replay_serper_batch(questions)
+
+    questions_data = [{"q": question, "autocorrect": False} for question in questions]
+    payload = json.dumps(questions_data)
+    with observe_call("serper", "search"):
+        response = await crawler.post(SERPER_URL, headers=headers, content=payload, timeout=30)
+
+        if response.status_code == 200:
+            if cassette.mode == "record":
+                record_serper_batch(questions, response)
+            return response
+        elif response.status_code == 403:
+            raise Exception("Failed to authenticate. Check your API key.")
+        else:
+            raise Exception(f"Error occurred: {response.text}")
+
+
+class SerperBatcher:
+    """Micro-batches Serper queries across every in-flight report.
+
+    Queries are queued for up to FC_SERPER_BATCH_WINDOW_MS (or until
+    FC_SERPER_BATCH_SIZE are waiting) and then sent as one batch POST; each
+    caller gets back the results of its own queries. Queues are kept per
+    event loop, since their futures are loop-bound.
+    """
+
+    def __init__(self, api_key: str, window: float = SERPER_BATCH_WINDOW, max_batch: int = SERPER_BATCH_SIZE):
+        self.api_key = api_key
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[int, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._tasks = set()
+        self.batches = 0
+        self.queries = 0
+
+    async def search(self, queries: List[str]) -> List[dict]:
+        """Search Serper for queries as part of the next shared batch
+
+        Args:
+            queries (list): the queries of one caller.
+
+        Returns:
+            list: the Serper result of each query, in input order.
+        """
+        loop = asyncio.get_running_loop()
+        futures = [self._enqueue(loop, query) for query in queries]
+        return list(await asyncio.gather(*futures))
+
+    def _enqueue(self, loop: asyncio.AbstractEventLoop, query: str) -> asyncio.Future:
+        future = loop.create_future()
+        pending = self._pending.setdefault(id(loop), [])
+        pending.append((query, future))
+        if len(pending) >= self.max_batch:
+            self._flush(loop)
+        elif id(loop) not in self._timers:
+            self._timers[id(loop)] = loop.call_later(self.window, self._flush, loop)
+        return future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop):
+        timer = self._timers.pop(id(loop), None)
+        if timer is not None:
+            timer.cancel()
+        # Callers that gave up in the meantime are not sent
+        pending = [(query, future) for query, future in self._pending.pop(id(loop), []) if not future.done()]
+        for i in range(0, len(pending), self.max_batch):
+            task = loop.create_task(self._send(pending[i : i + self.max_batch]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]):
+        self.batches += 1
+        self.queries += len(batch)
+        try:
+            response = await post_serper_batch(self.api_key, [query for query, _ in batch])
+            results = response.json()
+            if len(results) != len(batch):
+                raise Exception(f"Serper returned {len(results)} results for {len(batch)} queries")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "mean_batch_size": round(self.queries / self.batches, 2) if self.batches else 0.0,
+            "queued": sum(len(pending) for pending in self._pending.values()),
+        }
+
+
+_batchers: Dict[str, SerperBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(api_key: str) -> SerperBatcher:
+    """Return the process-wide batcher for an API key, so all reports share its batches"""
+    with _batchers_lock:
+        batcher = _batchers.get(api_key)
+        if batcher is None:
+            batcher = _batchers[api_key] = SerperBatcher(api_key)
+        return batcher
+
+
+def batcher_stats() -> Dict[str, float]:
+    """Batch counters summed over every batcher (they are keyed by API key, which is not exposed)"""
+    batches = sum(batcher.batches for batcher in _batchers.values())
+    queries = sum(batcher.queries for batcher in _batchers.values())
+    return {
+        "batches": batches,
+        "queries": queries,
+        "mean_batch_size": round(queries / batches, 2) if batches else 0.0,
+    }
@@ -1,20 +1,90 @@
-from concurrent.futures import ThreadPoolExecutor
 import json
 import requests
 import dotenv
 import os
 import re
+import threading
+from concurrent.futures.process import BrokenProcessPool
 import bs4
+from core.metrics import observe_call
+from .async_utils import run_sync
+from .cache import TieredCache, content_key, normalize_url
+from .cassette import cassette
+from .crawler import crawler
+from .document_store import document_store
+from .evidence_packer import tokenize, unit_term_vectors
+from .serper_batcher import SERPER_URL, get_batcher, post_serper_batch, record_serper_batch, replay_serper_batch
+from .singleflight import SingleFlight
+from .text_extract import is_tag_visible, page_text, visible_text  # noqa: F401
+from .tracing import span
+from .workers import aparse_map, parse_map
 
 dotenv.load_dotenv()
 
+# Serper results for a query are stable for hours and questions repeat across reports
+SERPER_CACHE_TTL = int(os.getenv("FC_SERPER_CACHE_TTL", 6 * 60 * 60))
+SERPER_CACHE_SIZE = int(os.getenv("FC_SERPER_CACHE_SIZE", 2048))
+SERPER_CACHE_PERSIST = os.getenv("FC_SERPER_CACHE_PERSIST", "1") == "1"
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> TieredCache:
+    """Process-wide cache of trimmed Serper results, keyed on normalized query and top_k"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = TieredCache(
+                "serper_results", ttl=SERPER_CACHE_TTL, max_entries=SERPER_CACHE_SIZE, persist=SERPER_CACHE_PERSIST
+            )
+        return _search_cache
+
+
+def trim_serper_response(response: dict, top_k: int) -> dict:
+    """Keep only what evidence retrieval reads from a Serper result"""
+    trimmed = {"searchParameters": response.get("searchParameters", {}), "organic": response.get("organic", [])[:top_k]}
+    if "answerBox" in response:
+        trimmed["answerBox"] = response["answerBox"]
+    return trimmed
+
+# Evidence depth: "fast" keeps the Serper snippets, "thorough" crawls and extends every
+# result, "adaptive" crawls only the queries whose snippets do not settle them
+EVIDENCE_MODES = ("fast", "adaptive", "thorough")
+# adaptive: snippets settle a query when they cover this share of its terms ...
+ADAPTIVE_COVERAGE = float(os.getenv("FC_ADAPTIVE_COVERAGE", 0.6))
+# ... and agree with each other (mean pairwise cosine similarity) at least this much
+ADAPTIVE_AGREEMENT = float(os.getenv("FC_ADAPTIVE_AGREEMENT", 0.2))
+
+
+def snippets_sufficient(query: str, snippets: list) -> bool:
+    """Whether a query's Serper snippets are enough evidence without crawling the pages
+
+    Args:
+        query (str): the search query.
+        snippets (list): the snippets of its organic results.
+
+    Returns:
+        bool: True if the snippets cover the query terms and agree with each other.
+    """
+    snippets = [snippet for snippet in snippets if snippet]
+    query_terms = set(tokenize(query))
+    if len(snippets) < 2 or not query_terms:
+        return False
+    snippet_terms = set(token for snippet in snippets for token in tokenize(snippet))
+    if len(query_terms & snippet_terms) / len(query_terms) < ADAPTIVE_COVERAGE:
+        return False
+    vectors = unit_term_vectors(snippets)
+    similarity = vectors @ vectors.T
+    n = len(snippets)
+    agreement = (similarity.sum() - similarity.trace()) / (n * (n - 1))
+    return agreement >= ADAPTIVE_AGREEMENT
+
 ################################################################################################
 import requests
 import time
 import bs4
 import asyncio
-from httpx import AsyncHTTPTransport
-from httpx._client import AsyncClient
 
 
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.14; rv:65.0) Gecko/20100101 Firefox/65.0"
@@ -23,57 +93,77 @@ MOBILE_USER_AGENT = "Mozilla/5.0 (Linux; Android 7.0; SM-G930V Build/NRD90M) App
 headers = {"User-Agent": USER_AGENT}
 
 
-def is_tag_visible(element: bs4.element) -> bool:
-    """Determines if an HTML element is visible.
+async def httpx_get(url: str, headers: dict):
+    # Goes through the shared, pooled crawler client so connections are reused
+    response = await crawler.get(url, headers=headers)
+    if response is None:
+        return False, None
+    return True, response
 
-    Args:
-        element: A BeautifulSoup element to check the visibility of.
-    returns:
-        Whether the element is visible.
-    """
-    if element.parent.name in [
-        "style",
-        "script",
-        "head",
-        "title",
-        "meta",
-        "[document]",
-    ] or isinstance(element, bs4.element.Comment):
-        return False
-    return True
 
+fetch_flight = SingleFlight("documents")
 
-transport = AsyncHTTPTransport(retries=3)
 
+async def afetch_document(url: str, headers: dict = headers):
+    """Return the page at url from the shared document store, downloading it at most once
 
-async def httpx_get(url: str, headers: dict):
-    try:
-        async with AsyncClient(transport=transport) as client:
-            response = await client.get(url, headers=headers, timeout=3)
-            response = response if response.status_code == 200 else None
-            if not response:
-                return False, None
-            else:
-                return True, response
-    except Exception as e:  # noqa: F841
-        return False, None
+    Args:
+        url (str): the page to fetch.
+        headers (dict, optional): request headers for a download.
+
+    Returns:
+        FetchedDocument: the page, or None if it could not be downloaded.
+    """
+    document = document_store.get(url)
+    if document is not None:
+        return document
+
+    async def download():
+        flag, document = await httpx_get(url, headers)
+        if not flag:
+            return None
+        return document_store.put(url, document)
+
+    # Concurrent requests for the same page share one download
+    document, _ = await fetch_flight.do(normalize_url(url), download)
+    return document
 
 
 async def httpx_bind_key(url: str, headers: dict, key: str = ""):
-    flag, response = await httpx_get(url, headers)
-    return flag, response, url, key
+    document = await afetch_document(url, headers)
+    return document is not None, document, url, key
 
 
 def crawl_web(query_url_dict: dict):
-    tasks = list()
-    for query, urls in query_url_dict.items():
-        for url in urls:
-            task = httpx_bind_key(url=url, headers=headers, key=query)
-            tasks.append(task)
-    asyncio.set_event_loop(asyncio.SelectorEventLoop())
-    loop = asyncio.get_event_loop()
-    responses = loop.run_until_complete(asyncio.gather(*tasks))
-    return responses
+    """Blocking wrapper of acrawl_web for synchronous callers"""
+    return run_sync(acrawl_web(query_url_dict))
+
+
+async def acrawl_urls(urls: list) -> list:
+    """Fetch pages under the crawler's global and per-host caps and within FC_CRAWL_DEADLINE
+
+    Args:
+        urls (list): the pages to fetch.
+
+    Returns:
+        list: a FetchedDocument per url, in input order; None for a page that
+            failed, was skipped or did not finish in time.
+    """
+    return await crawler.gather_prioritized(urls, lambda url: afetch_document(url, headers))
+
+
+async def acrawl_web(query_url_dict: dict):
+    """Awaitable counterpart of crawl_web for callers already inside an event loop.
+
+    A page that is skipped or unfinished comes back with a False flag, so the
+    caller keeps the Serper snippet for it.
+    """
+    jobs = [(query, url) for query, urls in query_url_dict.items() for url in urls]
+    documents = await acrawl_urls([url for _, url in jobs])
+    return [
+        (document is not None, document, url, query)
+        for (query, url), document in zip(jobs, documents)
+    ]
 
 
 # @backoff.on_exception(backoff.expo, (requests.exceptions.RequestException, requests.exceptions.Timeout), max_tries=1,max_time=3)
@@ -89,17 +179,10 @@ def parse_response(response: requests.Response, url: str, query: str = None):
     html_content = response.text
     url = url
     try:
-        soup = bs4.BeautifulSoup(html_content, "html.parser")
-        texts = soup.findAll(text=True)
-        # Filter out invisible text from the page.
-        visible_text = filter(is_tag_visible, texts)
+        # Visible text only, with spacing cleaned up
+        web_text = visible_text(html_content)
     except Exception as _:  # noqa: F841
         return None, url, query
-
-    # Returns all the text concatenated as a string.
-    web_text = " ".join(t.strip() for t in visible_text).strip()
-    # Clean up spacing.
-    web_text = " ".join(web_text.split())
     return web_text, url, query
 
 
@@ -122,17 +205,10 @@ def scrape_url(url: str, timeout: float = 3):
 
     # Extract out all text from the tags
     try:
-        soup = bs4.BeautifulSoup(response.text, "html.parser")
-        texts = soup.findAll(text=True)
-        # Filter out invisible text from the page.
-        visible_text = filter(is_tag_visible, texts)
+        # Visible text only, with spacing cleaned up
+        web_text = visible_text(response.text)
     except Exception as _:  # noqa: F841
         return None, url
-
-    # Returns all the text concatenated as a string.
-    web_text = " ".join(t.strip() for t in visible_text).strip()
-    # Clean up spacing.
-    web_text = " ".join(web_text.split())
     return web_text, url
 
 
@@ -150,6 +226,82 @@ def crawl_google_web(response, top_k: int = 10):
     # result_urls = [link.get("href") for link in node if link.get("href")]
     return result_urls[:top_k]
 
+
+def extend_snippet(html: str, snippet: str) -> str:
+    """Extend a snippet with the text following it on its page
+
+    Top-level and working on the raw page text so it can run in the parse pool.
+
+    Args:
+        html (str): the crawled page.
+        snippet (str): the snippet to extend from the search result
+
+    Returns:
+        str: the extended snippet, or the original snippet if it cannot be located.
+    """
+    text = page_text(html)
+    # Search for the snippet in text
+    snippet_start = text.find(snippet[:-10])
+    if snippet_start == -1:
+        return snippet
+    else:
+        pre_context_range = 0  # Number of characters around the snippet to display
+        post_context_range = 500  # Number of characters around the snippet to display
+        start = max(0, snippet_start - pre_context_range)
+        end = snippet_start + len(snippet) + post_context_range
+        return text[start:end] + " ..."
+
+
+def bs4_parse_text(response, snippet, flag):
+    """Parse the text from the response and extend the snippet
+
+    Args:
+        response (web response): the response from the web
+        snippet (str): the snippet to extend from the search result
+        flag (bool): flag to extend the snippet
+
+    Returns:
+        str: the extended snippet, or the original snippet if it cannot be located.
+    """
+    if flag and ".pdf" not in str(response.url):
+        return extend_snippet(response.text, snippet)
+    else:
+        return snippet
+
+
+def _pages_to_parse(responses: list, flags: list) -> list:
+    # Only successfully crawled, non-PDF pages are shipped to the parse pool
+    return [i for i, (response, flag) in enumerate(zip(responses, flags)) if flag and ".pdf" not in str(response.url)]
+
+
+def extend_snippets(responses: list, snippets: list, flags: list) -> list:
+    """Extend every snippet from its crawled page in the shared parse pool, keeping the input order
+
+    Args:
+        responses (list): the crawled web responses.
+        snippets (list): the serper snippets, aligned with responses.
+        flags (list): whether each crawl succeeded, aligned with responses.
+
+    Returns:
+        list: the extended snippets.
+    """
+    todo = _pages_to_parse(responses, flags)
+    extended = list(snippets)
+    parsed = parse_map(extend_snippet, [responses[i].text for i in todo], [snippets[i] for i in todo])
+    for i, snippet in zip(todo, parsed):
+        extended[i] = snippet
+    return extended
+
+
+async def aextend_snippets(responses: list, snippets: list, flags: list) -> list:
+    """Awaitable extend_snippets: the pages are parsed in chunks in the parse pool"""
+    todo = _pages_to_parse(responses, flags)
+    extended = list(snippets)
+    parsed = await aparse_map(extend_snippet, [responses[i].text for i in todo], [snippets[i] for i in todo])
+    for i, snippet in zip(todo, parsed):
+        extended[i] = snippet
+    return extended
+
 ################################################################################################
 
 import os
@@ -188,21 +340,46 @@ class SerperEvidenceRetriever:
         self.serper_key = api_key
         
 
-    def retrieve_evidence(self, claim_queries_dict, top_k: int = 3, snippet_extend_flag: bool = True):
-        """Retrieve evidences for the given claims
+    def retrieve_evidence(
+        self, claim_queries_dict, top_k: int = 3, snippet_extend_flag: bool = True, mode: str = "thorough"
+    ):
+        """Retrieve evidences for the given claims (blocking wrapper of aretrieve_evidence)
 
         Args:
             claim_queries_dict (dict): a dictionary of claims and their corresponding queries.
             top_k (int, optional): the number of top relevant results to retrieve. Defaults to 3.
             snippet_extend_flag (bool, optional): whether to extend the snippet. Defaults to True.
+            mode (str, optional): evidence depth, one of EVIDENCE_MODES. Defaults to "thorough".
 
         Returns:
             dict: a dictionary of claims and their corresponding evidences.
         """
+        return run_sync(
+            self.aretrieve_evidence(
+                claim_queries_dict, top_k=top_k, snippet_extend_flag=snippet_extend_flag, mode=mode
+            )
+        )
+
+    async def aretrieve_evidence(
+        self, claim_queries_dict, top_k: int = 3, snippet_extend_flag: bool = True, mode: str = "thorough"
+    ):
+        """Retrieve evidences for the given claims without blocking the event loop
+
+        Args:
+            claim_queries_dict (dict): a dictionary of claims and their corresponding queries.
+            top_k (int, optional): the number of top relevant results to retrieve. Defaults to 3.
+            snippet_extend_flag (bool, optional): whether to extend the snippet. Defaults to True.
+            mode (str, optional): evidence depth, one of EVIDENCE_MODES. Defaults to "thorough".
+
+        Returns:
+            dict: a dictionary of claims and their corresponding evidences. Each
+                evidence has "text", "url" and "extended" (whether the text
+                comes from the crawled page rather than the Serper snippet).
+        """
         logger.info("Collecting evidences ...")
         query_list = [y for x in claim_queries_dict.items() for y in x[1]]
-        evidence_list = self._retrieve_evidence_4_all_claim(
-            query_list=query_list, top_k=top_k, snippet_extend_flag=snippet_extend_flag
+        evidence_list = await self._retrieve_evidence_4_all_claim(
+            query_list=query_list, top_k=top_k, snippet_extend_flag=snippet_extend_flag, mode=mode
         )
 
         i = 0
@@ -216,8 +393,8 @@ class SerperEvidenceRetriever:
 
         return claim_evidence_dict
 
-    def _retrieve_evidence_4_all_claim(
-        self, query_list: list[str], top_k: int = 3, snippet_extend_flag: bool = True
+    async def _retrieve_evidence_4_all_claim(
+        self, query_list: list[str], top_k: int = 3, snippet_extend_flag: bool = True, mode: str = "thorough"
     ) -> list[list[str]]:
         """Retrieve evidences for the given queries
 
@@ -225,129 +402,83 @@ class SerperEvidenceRetriever:
             query_list (list[str]): a list of queries to retrieve evidences for.
             top_k (int, optional): the number of top relevant results to retrieve. Defaults to 3.
             snippet_extend_flag (bool, optional): whether to extend the snippet. Defaults to True.
+            mode (str, optional): evidence depth, one of EVIDENCE_MODES. Defaults to "thorough".
 
         Returns:
             list[list[]]: a list of [a list of evidences for each given query].
         """
 
-        # init the evidence list with None
+        # Evidence table indexed by query id (the position in query_list), so
+        # duplicate queries keep their own evidence and regrouping is linear
         evidences = [[] for _ in query_list]
 
-        # get the response from serper
-        serper_responses = []
-        for i in range(0, len(query_list), 100):
-            batch_query_list = query_list[i : i + 100]
-            batch_response = self._request_serper_api(batch_query_list)
-            if batch_response is None:
-                logger.error("Serper API request error!")
-                return evidences
-            else:
-                serper_responses += batch_response.json()
+        # get the response from serper (cache first, the rest in a shared batch)
+        serper_responses = await self._asearch(query_list, top_k)
 
-        # get the responses for queries with an answer box
-        query_url_dict = {}
-        url_to_date = {}  # TODO: decide whether to use date
-        _snippet_to_check = []
-        for i, (query, response) in enumerate(zip(query_list, serper_responses)):
+        # one row per organic result: (query id, url, serper snippet)
+        rows = []
+        for query_id, (query, response) in enumerate(zip(query_list, serper_responses)):
             if query != response.get("searchParameters").get("q"):
                 logger.error("Serper change query from {} TO {}".format(query, response.get("searchParameters").get("q")))
 
             # TODO: provide the link for the answer box
             if "answerBox" in response:
-                if "answer" in response["answerBox"]:
-                    evidences[i] = [
-                        {
-                            "text": f"{query}\nAnswer: {response['answerBox']['answer']}",
-                            "url": "Google Answer Box",
-                        }
-                    ]
-                else:
-                    evidences[i] = [
-                        {
-                            "text": f"{query}\nAnswer: {response['answerBox']['snippet']}",
-                            "url": "Google Answer Box",
-                        }
-                    ]
+                answer = response["answerBox"].get("answer", response["answerBox"].get("snippet"))
+                evidences[query_id] = [
+                    {
+                        "text": f"{query}\nAnswer: {answer}",
+                        "url": "Google Answer Box",
+                        "extended": False,
+                    }
+                ]
             # TODO: currently --- if there is google answer box, we only got 1 evidence, otherwise, we got multiple, this will deminish the value of the google answer.
             else:
-                topk_results = response.get("organic", [])[:top_k]  # Choose top 5 response
-
-                if (len(_snippet_to_check) == 0) or (not snippet_extend_flag):
-                    evidences[i] += [
-                        {"text": re.sub(r"\n+", "\n", _result["snippet"]), "url": _result["link"]} for _result in topk_results
-                    ]
-
-                # Save date for each url
-                url_to_date.update({_result.get("link"): _result.get("date") for _result in topk_results})
-                # Save query-url pair, 1 query may have multiple urls
-                query_url_dict.update({query: [_result.get("link") for _result in topk_results]})
-                _snippet_to_check += [_result["snippet"] if "snippet" in _result else "" for _result in topk_results]
-
-        # return if there is no snippet to check or snippet_extend_flag is False
-        if (len(_snippet_to_check) == 0) or (not snippet_extend_flag):
-            return evidences
-
-        # crawl web for queries without answer box
-        responses = crawl_web(query_url_dict)
-        # Get extended snippets based on the snippet from serper
-        flag_to_check = [_item[0] for _item in responses]
-        response_to_check = [_item[1] for _item in responses]
-        url_to_check = [_item[2] for _item in responses]
-        query_to_check = [_item[3] for _item in responses]
-
-        def bs4_parse_text(response, snippet, flag):
-            """Parse the text from the response and extend the snippet
-
-            Args:
-                response (web response): the response from the web
-                snippet (str): the snippet to extend from the search result
-                flag (bool): flag to extend the snippet
-
-            Returns:
-                _type_: _description_
-            """
-            if flag and ".pdf" not in str(response.url):
-                soup = bs4.BeautifulSoup(response.text, "html.parser")
-                text = soup.get_text()
-                # Search for the snippet in text
-                snippet_start = text.find(snippet[:-10])
-                if snippet_start == -1:
-                    return snippet
-                else:
-                    pre_context_range = 0  # Number of characters around the snippet to display
-                    post_context_range = 500  # Number of characters around the snippet to display
-                    start = max(0, snippet_start - pre_context_range)
-                    end = snippet_start + len(snippet) + post_context_range
-                    return text[start:end] + " ..."
+                topk_results = response.get("organic", [])[:top_k]
+                rows += [(query_id, _result["link"], _result.get("snippet", "")) for _result in topk_results if _result.get("link")]
+
+        # pick the queries whose results get crawled and extended
+        if not snippet_extend_flag or mode == "fast":
+            extend_ids = set()
+        elif mode == "adaptive":
+            snippets_by_query = {}
+            for query_id, _, snippet in rows:
+                snippets_by_query.setdefault(query_id, []).append(snippet)
+            extend_ids = {
+                query_id for query_id, snippets in snippets_by_query.items()
+                if not snippets_sufficient(query_list[query_id], snippets)
+            }
+        else:
+            extend_ids = {query_id for query_id, _, _ in rows}
+        to_extend = [row for row in rows if row[0] in extend_ids]
+
+        extended_by_pair = {}
+        if to_extend:
+            # crawl each distinct url once, however many queries returned it
+            urls = list(dict.fromkeys(url for _, url, _ in to_extend))
+            with span("crawl", urls=len(urls)) as stage:
+                documents = dict(zip(urls, await acrawl_urls(urls)))
+                fetched = [page for page in documents.values() if page is not None]
+                stage.set(fetched=len(fetched), chars=sum(len(page.text) for page in fetched))
+
+            # extend each distinct (page, snippet) pair once
+            pairs = list(dict.fromkeys((url, snippet) for _, url, snippet in to_extend))
+            pages = [documents[url] for url, _ in pairs]
+            # HTML parsing is CPU bound: run it in the shared process pool, off the event loop
+            try:
+                with span("extend_snippets", snippets=len(pairs)):
+                    extended = await aextend_snippets(pages, [snippet for _, snippet in pairs], [page is not None for page in pages])
+            except BrokenProcessPool:
+                # A parse worker died; the pool restarts on its next use, this report keeps the Serper snippets
+                logger.error("Parse pool broke while extending {} snippets".format(len(pairs)))
             else:
-                return snippet
-
-        # Question: if os.cpu_count() cause problems when running in parallel?
-        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-            _extended_snippet = list(
-                executor.map(
-                    lambda _r, _s, _f: bs4_parse_text(_r, _s, _f),
-                    response_to_check,
-                    _snippet_to_check,
-                    flag_to_check,
-                )
-            )
-
-        # merge the snippets by query
-        query_snippet_url_dict = {}
-        for _query, _url, _snippet in zip(query_to_check, url_to_check, _extended_snippet):
-            _snippet_url_list = query_snippet_url_dict.get(_query, [])
-            _snippet_url_list.append((_snippet, _url))
-            query_snippet_url_dict[_query] = _snippet_url_list
-
-        # extend the evidence list for each query
-        for _query in query_snippet_url_dict.keys():
-            _query_index = query_list.index(_query)
-            _snippet_url_list = query_snippet_url_dict[_query]
-            evidences[_query_index] += [
-                {"text": re.sub(r"\n+", "\n", snippet), "url": _url} for snippet, _url in _snippet_url_list
-            ]
-
+                extended_by_pair = {
+                    pair: (text, page is not None) for pair, text, page in zip(pairs, extended, pages)
+                }
+
+        for query_id, url, snippet in rows:
+            # Results that were not crawled (or failed to) keep their Serper snippet
+            text, crawled = extended_by_pair.get((url, snippet), (snippet, False))
+            evidences[query_id].append({"text": re.sub(r"\n+", "\n", text), "url": url, "extended": crawled})
         return evidences
 
     def _request_serper_api(self, questions):
@@ -359,24 +490,74 @@ class SerperEvidenceRetriever:
         Returns:
             web response: the response from the serper api
         """
-        url = "https://google.serper.dev/search"
+        url = SERPER_URL
 
         headers = {
             "X-API-KEY": self.serper_key,
             "Content-Type": "application/json",
         }
 
+        if cassette.mode == "replay":
+            return replay_serper_batch(questions)
+
         questions_data = [{"q": question, "autocorrect": False} for question in questions]
         payload = json.dumps(questions_data)
         response = None
-        response = requests.request("POST", url, headers=headers, data=payload)
+        with observe_call("serper", "search"):
+            response = requests.request("POST", url, headers=headers, data=payload)
+
+            if response.status_code == 200:
+                if cassette.mode == "record":
+                    record_serper_batch(questions, response)
+                return response
+            elif response.status_code == 403:
+                raise Exception("Failed to authenticate. Check your API key.")
+            else:
+                raise Exception(f"Error occurred: {response.text}")
 
-        if response.status_code == 200:
-            return response
-        elif response.status_code == 403:
-            raise Exception("Failed to authenticate. Check your API key.")
-        else:
-            raise Exception(f"Error occurred: {response.text}")
+    async def _asearch(self, query_list: list[str], top_k: int) -> list[dict]:
+        """Serper results for every query, leaving cached queries out of the POST
+
+        Args:
+            query_list (list[str]): the queries.
+            top_k (int): the number of organic results kept per query.
+
+        Returns:
+            list[dict]: the (trimmed) Serper result of each query, in input order.
+        """
+        cache = get_search_cache()
+        keys = [content_key(query, top_k) for query in query_list]
+        results = [None] * len(query_list)
+        missing = {}  # cache key -> positions of the queries that need it
+        for i, (query, key) in enumerate(zip(query_list, keys)):
+            cached = cache.get(key) if key not in missing else None
+            if cached is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                # The entry may come from a differently cased/spaced query
+                results[i] = dict(cached, searchParameters={**cached.get("searchParameters", {}), "q": query})
+
+        if missing:
+            positions = list(missing.values())
+            with span("serper", queries=len(query_list), cached=len(query_list) - sum(map(len, positions)), fetched=len(positions)):
+                fetched = await get_batcher(self.serper_key).search([query_list[p[0]] for p in positions])
+            for key, same_query, response in zip(missing, positions, fetched):
+                response = trim_serper_response(response, top_k)
+                cache.set(key, response)
+                for i in same_query:
+                    results[i] = dict(response, searchParameters={**response["searchParameters"], "q": query_list[i]})
+        return results
+
+    async def _arequest_serper_api(self, questions):
+        """Request the serper api without blocking the event loop
+
+        Args:
+            questions (list): a list of questions to request the serper api.
+
+        Returns:
+            web response: the response from the serper api
+        """
+        return await post_serper_batch(self.serper_key, questions)
 
 
 if __name__ == "__main__":
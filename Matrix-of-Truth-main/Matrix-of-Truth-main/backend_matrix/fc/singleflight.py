@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Flight:
+    """One in-flight execution and the number of callers currently awaiting it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight execution.
+
+    The first caller for a key starts the work as a task; callers arriving while
+    it runs await the same task and receive its result (or its exception). The
+    task is shielded, so a leader that disconnects does not cancel the work its
+    followers are waiting on. Once the last waiter is cancelled the task is
+    cancelled too, so abandoned work (e.g. a crawl past its deadline) releases
+    whatever it holds instead of running on for nobody.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._inflight: Dict[Tuple[int, Hashable], _Flight] = {}
+        self.leaders = 0
+        self.followers = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run fn() once per key at a time.
+
+        Args:
+            key: the normalized identity of the work.
+            fn: zero-argument callable returning the awaitable to run.
+        Returns:
+            (result, shared) where shared is True if this caller joined a run
+            started by another caller.
+        """
+        loop = asyncio.get_running_loop()
+        # Tasks are bound to their loop, so flights never cross event loops
+        flight_key = (id(loop), key)
+
+        flight = self._inflight.get(flight_key)
+        shared = flight is not None
+        if shared:
+            self.followers += 1
+        else:
+            self.leaders += 1
+            flight = _Flight(loop.create_task(fn()))
+            self._inflight[flight_key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(flight_key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller gave up; later callers start a fresh run
+                self.abandoned += 1
+                self._forget(flight_key, flight)
+                flight.task.cancel()
+                # Let the task unwind (closing its connection, releasing its slots) before returning
+                await asyncio.wait([flight.task])
+
+    def _forget(self, flight_key: Tuple[int, Hashable], flight: _Flight):
+        if self._inflight.get(flight_key) is flight:
+            del self._inflight[flight_key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "abandoned": self.abandoned,
+        }
@@ -0,0 +1,256 @@
+"""
+HTML-to-text extraction used by snippet extension and page scraping.
+
+Two operations are provided, each reproducing an existing bs4 idiom:
+    page_text(html)     == BeautifulSoup(html, "html.parser").get_text()
+    visible_text(html)  == the findAll(text=True) + is_tag_visible join, with
+                           whitespace collapsed
+
+The default "lxml" extractor parses with libxml2 and walks the tree once;
+"bs4" is the original pure-Python path and the fallback whenever
+lxml is missing or cannot parse a page. libxml2 repairs malformed markup
+differently from html.parser (it wraps bare text in <html><body><p> and
+drops what follows </html>), so pages without a plain <html> element, and
+pages whose lxml text comes out empty or much shorter than expected, are
+extracted with bs4 as well. FC_TEXT_EXTRACTOR selects the extractor, and
+register_extractor() plugs in others.
+"""
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import bs4
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+TEXT_EXTRACTOR = os.getenv("FC_TEXT_EXTRACTOR", "lxml")
+# lxml text with fewer non-space characters than this share of the page's rough
+# text (markup stripped by a regex) is extracted again with bs4
+LXML_MIN_TEXT_RATIO = float(os.getenv("FC_LXML_MIN_TEXT_RATIO", 0.5))
+
+# Text whose immediate parent is one of these tags is not visible ("[document]" = top level)
+HIDDEN_PARENTS = frozenset(["style", "script", "head", "title", "meta", "[document]"])
+# get_text() skips every string inside these tags (bs4 stores them as Script,
+# Stylesheet, TemplateString, RubyTextString ... rather than NavigableString)
+NON_TEXT_CONTAINERS = frozenset(["script", "style", "template", "rt", "rp"])
+# Outside these tags bs4 squashes whitespace-only strings to a single "\n" or " "
+PRESERVE_WHITESPACE = frozenset(["pre", "textarea"])
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+def is_tag_visible(element: bs4.element) -> bool:
+    """Determines if an HTML element is visible.
+
+    Args:
+        element: A BeautifulSoup element to check the visibility of.
+    returns:
+        Whether the element is visible.
+    """
+    if element.parent.name in HIDDEN_PARENTS or isinstance(element, bs4.element.Comment):
+        return False
+    return True
+
+
+def collapse_whitespace(strings) -> str:
+    return " ".join(" ".join(strings).split())
+
+
+################################################################################################
+# bs4 (reference implementation)
+
+
+def bs4_page_text(html: str) -> str:
+    return bs4.BeautifulSoup(html, "html.parser").get_text()
+
+
+def bs4_visible_text(html: str) -> str:
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    return collapse_whitespace(filter(is_tag_visible, soup.findAll(text=True)))
+
+
+################################################################################################
+# lxml
+
+_parsers = threading.local()
+
+
+def _lxml_parse(html: str):
+    """Parse html into an lxml tree, or None for an empty document"""
+    if not html or not html.strip():
+        return None
+    # lxml parsers must not be shared between threads
+    parser = getattr(_parsers, "html", None)
+    if parser is None:
+        parser = _parsers.html = etree.HTMLParser()
+    try:
+        return etree.fromstring(html, parser)
+    except ValueError:
+        # str input with an XML encoding declaration has to be parsed as bytes
+        return etree.fromstring(html.encode("utf-8"), etree.HTMLParser(encoding="utf-8"))
+
+
+_HTML_OPEN = re.compile(r"<html[\s>/]", re.I)
+_HTML_CLOSE = re.compile(r"</html\s*>", re.I)
+# Top-level markup html.parser keeps out of get_text(): comments, doctype, processing instructions
+_TOP_LEVEL_MARKUP = re.compile(r"<!--.*?(?:-->|$)|<![^>]*>|<\?[^>]*>", re.S)
+_HEAD = re.compile(r"<head[\s>/].*?(?:</head\s*>|<body[\s>/]|$)", re.S | re.I)
+_HEAD_TEXT_TAGS = re.compile(r"<(title|script|style|template|noscript)\b.*?</\1\s*>", re.S | re.I)
+_ROUGH_MARKUP = re.compile(r"<(script|style|template)\b.*?</\1\s*>|<!--.*?-->|<[^>]*>", re.S | re.I)
+
+
+def _document_shape(html: str) -> Optional[Tuple[List[str], List[str]]]:
+    """The top-level strings before and after the <html> element, as html.parser stores them
+
+    Returns None when the page is not a single <html> element surrounded by
+    whitespace, comments and declarations: libxml2 would restructure it, so
+    only bs4 gives the reference output. The same goes for text inside
+    <head> outside of title/script/style, which libxml2 moves into <body>.
+    """
+    start = _HTML_OPEN.search(html)
+    if start is None:
+        return None
+    end = None
+    for end in _HTML_CLOSE.finditer(html, start.start()):
+        pass
+    prologue = _TOP_LEVEL_MARKUP.split(html[: start.start()])
+    epilogue = _TOP_LEVEL_MARKUP.split(html[end.end():]) if end is not None else []
+    if any(part.strip(ASCII_SPACES) for part in prologue + epilogue):
+        return None
+    head = _HEAD.search(html, start.start())
+    if head is not None and _ROUGH_MARKUP.sub("", _HEAD_TEXT_TAGS.sub("", head.group())).strip(ASCII_SPACES):
+        return None
+    return [part for part in prologue if part], [part for part in epilogue if part]
+
+
+def _too_short(text: str, html: str) -> bool:
+    """Whether the lxml text is empty or much shorter than the page's rough text"""
+    rough = len("".join(_ROUGH_MARKUP.sub(" ", html).split()))
+    return len("".join(text.split())) < LXML_MIN_TEXT_RATIO * rough
+
+
+def _squash_blank(string: str) -> str:
+    """bs4's treatment of a whitespace-only string outside <pre>/<textarea>"""
+    if string.strip(ASCII_SPACES):
+        return string
+    return "\n" if "\n" in string else " "
+
+
+def _lxml_strings(html: str, hidden_parents=frozenset(), hidden_containers=frozenset()) -> List[str]:
+    """Text and tail strings of the tree in document order, as bs4 would store them.
+
+    A string is dropped if its immediate parent is in hidden_parents or if it
+    lies anywhere inside a tag in hidden_containers. As in bs4, an element's
+    text belongs to the element and its tail to the element's parent.
+    Comments and processing instructions contribute only their tails.
+    """
+    root = _lxml_parse(html)
+    if root is None:
+        return []
+
+    strings = []
+    # (element, inside a hidden container, inside <pre>, entering?) - iterative to keep deep pages off the C stack
+    stack = [(root, False, False, True)]
+    while stack:
+        element, contained, preserved, entering = stack.pop()
+        if not entering:
+            # The tail follows the element's subtree and belongs to its parent
+            parent = element.getparent()
+            parent_name = parent.tag if parent is not None else "[document]"
+            if element.tail and not contained and parent_name not in hidden_parents:
+                strings.append(element.tail if preserved else _squash_blank(element.tail))
+            continue
+
+        stack.append((element, contained, preserved, False))
+        if not isinstance(element.tag, str):
+            # Comment / processing instruction
+            continue
+        inner = contained or element.tag in hidden_containers
+        inner_preserved = preserved or element.tag in PRESERVE_WHITESPACE
+        if element.text and not inner and element.tag not in hidden_parents:
+            strings.append(element.text if inner_preserved else _squash_blank(element.text))
+        for child in reversed(element):
+            stack.append((child, inner, inner_preserved, True))
+    return strings
+
+
+def lxml_page_text(html: str) -> str:
+    shape = _document_shape(html)
+    if shape is None:
+        return bs4_page_text(html)
+    prologue, epilogue = shape
+    text = "".join(_lxml_strings(html, hidden_containers=NON_TEXT_CONTAINERS))
+    if _too_short(text, html):
+        return bs4_page_text(html)
+    # Whitespace around <html> is kept by html.parser, squashed like any other blank string
+    return "".join(map(_squash_blank, prologue)) + text + "".join(map(_squash_blank, epilogue))
+
+
+def lxml_visible_text(html: str) -> str:
+    if _document_shape(html) is None:
+        return bs4_visible_text(html)
+    text = collapse_whitespace(_lxml_strings(html, hidden_parents=HIDDEN_PARENTS))
+    if _too_short(text, html):
+        return bs4_visible_text(html)
+    return text
+
+
+################################################################################################
+# Registry
+
+_extractors: Dict[str, Tuple[Callable[[str], str], Callable[[str], str]]] = {
+    "bs4": (bs4_page_text, bs4_visible_text),
+}
+if LXML_AVAILABLE:
+    _extractors["lxml"] = (lxml_page_text, lxml_visible_text)
+
+
+def register_extractor(name: str, page_text_fn: Callable[[str], str], visible_text_fn: Callable[[str], str]):
+    """Make an extractor selectable through FC_TEXT_EXTRACTOR"""
+    _extractors[name] = (page_text_fn, visible_text_fn)
+
+
+def get_extractor(name: Optional[str] = None) -> Tuple[str, Tuple[Callable[[str], str], Callable[[str], str]]]:
+    """Return (name, (page_text, visible_text)) of the configured extractor, bs4 if it is unavailable"""
+    name = name or TEXT_EXTRACTOR
+    if name not in _extractors:
+        name = "bs4"
+    return name, _extractors[name]
+
+
+def page_text(html: str) -> str:
+    """All text of the page, as BeautifulSoup(html, "html.parser").get_text() returns it
+
+    Args:
+        html: the page source.
+    Returns:
+        The concatenated text, without script/style contents and comments.
+    """
+    name, (page_text_fn, _) = get_extractor()
+    try:
+        return page_text_fn(html)
+    except Exception:
+        if name == "bs4":
+            raise
+        return bs4_page_text(html)
+
+
+def visible_text(html: str) -> str:
+    """Visible text of the page with whitespace collapsed
+
+    Args:
+        html: the page source.
+    Returns:
+        The text of every string whose parent is not style/script/head/title/meta.
+    """
+    name, (_, visible_text_fn) = get_extractor()
+    try:
+        return visible_text_fn(html)
+    except Exception:
+        if name == "bs4":
+            raise
+        return bs4_visible_text(html)
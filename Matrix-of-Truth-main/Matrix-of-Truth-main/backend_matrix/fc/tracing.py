@@ -0,0 +1,139 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+# Finished traces kept for /traces, and duration samples kept per stage for the percentiles
+TRACE_HISTORY = int(os.getenv("FC_TRACE_HISTORY", 50))
+TRACE_SAMPLES = int(os.getenv("FC_TRACE_SAMPLES", 1000))
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("fc_current_span", default=None)
+
+_lock = threading.Lock()
+_traces: Deque[Dict[str, Any]] = deque(maxlen=TRACE_HISTORY)
+_durations: Dict[str, Deque[float]] = {}
+_counts: Dict[str, int] = {}
+_errors: Dict[str, int] = {}
+
+
+class Span:
+    """One timed stage of a fact-check run, with attributes (counts, sizes) and child stages.
+
+    Used as a context manager; the span becomes the parent of every span opened
+    inside it, including in tasks started from it (asyncio copies the context
+    into new tasks), so concurrent stages nest under the stage that spawned them.
+    """
+
+    def __init__(self, name: str, root: bool = False, **attributes):
+        self.name = name
+        self.root = root
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self.children: List["Span"] = []
+        self.error: Optional[str] = None
+        self.started_at = datetime.now()
+        self._start = 0.0
+        self.duration_ms: Optional[float] = None
+        self._token = None
+
+    def set(self, **attributes) -> "Span":
+        """Record attributes (item counts, bytes, prompt sizes ...) on the span"""
+        self.attributes.update(attributes)
+        return self
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        if parent is not None and not self.root:
+            parent.children.append(self)
+        self._token = _current_span.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _record(self)
+        if self.root:
+            with _lock:
+                _traces.append(self.to_dict())
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 2) if self.duration_ms is not None else None,
+            "attributes": self.attributes,
+            "error": self.error,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+def start_trace(name: str, **attributes) -> Span:
+    """Open the root span of a new trace; it is stored with the recent traces when it ends"""
+    return Span(name, root=True, **attributes)
+
+
+def span(name: str, **attributes) -> Span:
+    """Open a stage span under the current one (or a free-standing one outside any trace)"""
+    return Span(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def annotate(**attributes):
+    """Set attributes on the current span, if there is one"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def _record(finished: Span):
+    with _lock:
+        samples = _durations.get(finished.name)
+        if samples is None:
+            samples = _durations[finished.name] = deque(maxlen=TRACE_SAMPLES)
+        samples.append(finished.duration_ms)
+        _counts[finished.name] = _counts.get(finished.name, 0) + 1
+        if finished.error is not None:
+            _errors[finished.name] = _errors.get(finished.name, 0) + 1
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    # Nearest-rank percentile of an already sorted sample
+    index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def stage_stats() -> Dict[str, Dict[str, float]]:
+    """p50/p95/p99/max latency (ms) per stage over its last FC_TRACE_SAMPLES runs, plus counts"""
+    with _lock:
+        snapshot = {name: sorted(samples) for name, samples in _durations.items()}
+        counts = dict(_counts)
+        errors = dict(_errors)
+    return {
+        name: {
+            "count": counts.get(name, 0),
+            "errors": errors.get(name, 0),
+            "p50_ms": round(_percentile(ordered, 50), 2),
+            "p95_ms": round(_percentile(ordered, 95), 2),
+            "p99_ms": round(_percentile(ordered, 99), 2),
+            "max_ms": round(ordered[-1], 2),
+        }
+        for name, ordered in sorted(snapshot.items())
+        if ordered
+    }
+
+
+def recent_traces(limit: int = 10) -> List[Dict[str, Any]]:
+    """The most recent finished traces, newest first"""
+    with _lock:
+        traces = list(_traces)
+    return traces[::-1][:limit]
@@ -1,8 +1,9 @@
 import requests
 import bs4
 import asyncio
-from httpx import AsyncHTTPTransport
-from httpx._client import AsyncClient
+from .async_utils import run_sync
+from .crawler import crawler
+from .text_extract import is_tag_visible, visible_text  # noqa: F401
 
 
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.14; rv:65.0) Gecko/20100101 Firefox/65.0"
@@ -11,40 +12,11 @@ MOBILE_USER_AGENT = "Mozilla/5.0 (Linux; Android 7.0; SM-G930V Build/NRD90M) App
 headers = {"User-Agent": USER_AGENT}
 
 
-def is_tag_visible(element: bs4.element) -> bool:
-    """Determines if an HTML element is visible.
-
-    Args:
-        element: A BeautifulSoup element to check the visibility of.
-    returns:
-        Whether the element is visible.
-    """
-    if element.parent.name in [
-        "style",
-        "script",
-        "head",
-        "title",
-        "meta",
-        "[document]",
-    ] or isinstance(element, bs4.element.Comment):
-        return False
-    return True
-
-
-transport = AsyncHTTPTransport(retries=3)
-
-
 async def httpx_get(url: str, headers: dict):
-    try:
-        async with AsyncClient(transport=transport) as client:
-            response = await client.get(url, headers=headers, timeout=3)
-            response = response if response.status_code == 200 else None
-            if not response:
-                return False, None
-            else:
-                return True, response
-    except Exception as e:  # noqa: F841
+    response = await crawler.get(url, headers=headers)
+    if response is None:
         return False, None
+    return True, response
 
 
 async def httpx_bind_key(url: str, headers: dict, key: str = ""):
@@ -52,42 +24,41 @@ async def httpx_bind_key(url: str, headers: dict, key: str = ""):
     return flag, response, url, key
 
 
+async def acrawl_web(query_url_dict: dict):
+    jobs = [(query, url) for query, urls in query_url_dict.items() for url in urls]
+    responses = await crawler.gather_prioritized(
+        [url for _, url in jobs], lambda url: crawler.get(url, headers=headers)
+    )
+    return [
+        (response is not None, response, url, query)
+        for (query, url), response in zip(jobs, responses)
+    ]
+
+
 def crawl_web(query_url_dict: dict):
-    tasks = list()
-    for query, urls in query_url_dict.items():
-        for url in urls:
-            task = httpx_bind_key(url=url, headers=headers, key=query)
-            tasks.append(task)
-    asyncio.set_event_loop(asyncio.SelectorEventLoop())
-    loop = asyncio.get_event_loop()
-    responses = loop.run_until_complete(asyncio.gather(*tasks))
-    return responses
+    return run_sync(acrawl_web(query_url_dict))
 
 
 # @backoff.on_exception(backoff.expo, (requests.exceptions.RequestException, requests.exceptions.Timeout), max_tries=1,max_time=3)
 def common_web_request(url: str, query: str = None, timeout: int = 3):
-    resp = requests.get(url, headers=headers, timeout=timeout)
+    # Streamed and byte-capped by the crawler; None for failures and non-HTML pages
+    resp = run_sync(crawler.get(url, headers=headers, timeout=timeout))
     if query:
         return resp, query
     else:
         return resp
 
 
-def parse_response(response: requests.Response, url: str, query: str = None):
+def parse_response(response, url: str, query: str = None):
+    if response is None:
+        return None, url, query
     html_content = response.text
     url = url
     try:
-        soup = bs4.BeautifulSoup(html_content, "html.parser")
-        texts = soup.findAll(text=True)
-        # Filter out invisible text from the page.
-        visible_text = filter(is_tag_visible, texts)
+        # Visible text only, with spacing cleaned up
+        web_text = visible_text(html_content)
     except Exception as _:  # noqa: F841
         return None, url, query
-
-    # Returns all the text concatenated as a string.
-    web_text = " ".join(t.strip() for t in visible_text).strip()
-    # Clean up spacing.
-    web_text = " ".join(web_text.split())
     return web_text, url, query
 
 
@@ -110,17 +81,10 @@ def scrape_url(url: str, timeout: float = 3):
 
     # Extract out all text from the tags
     try:
-        soup = bs4.BeautifulSoup(response.text, "html.parser")
-        texts = soup.findAll(text=True)
-        # Filter out invisible text from the page.
-        visible_text = filter(is_tag_visible, texts)
+        # Visible text only, with spacing cleaned up
+        web_text = visible_text(response.text)
     except Exception as _:  # noqa: F841
         return None, url
-
-    # Returns all the text concatenated as a string.
-    web_text = " ".join(t.strip() for t in visible_text).strip()
-    # Clean up spacing.
-    web_text = " ".join(web_text.split())
     return web_text, url
 
 
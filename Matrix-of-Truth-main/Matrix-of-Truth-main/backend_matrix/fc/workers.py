@@ -0,0 +1,94 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Size of the shared pool for CPU-bound parsing; 0 falls back to the default thread pool
+PARSE_WORKERS = int(os.getenv("FC_PARSE_WORKERS", os.cpu_count() or 1))
+# Items per IPC round trip in parse_map/aparse_map; 0 means one chunk per worker
+PARSE_CHUNKSIZE = int(os.getenv("FC_PARSE_CHUNKSIZE", 0))
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool():
+    """Return the long-lived process pool used for HTML/article parsing, creating it on first use"""
+    global _parse_pool
+    if PARSE_WORKERS <= 0:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # spawn, not fork: the server process holds threads, sockets and SQLite handles.
+            # A spawned worker re-runs the __main__ script, which is why main.py imports
+            # the app only outside of parse workers
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _parse_pool
+
+
+def shutdown_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
+
+async def run_in_parse_pool(fn, *args):
+    """Run a picklable, top-level function in the parse pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_parse_pool(), fn, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge page); start a fresh pool for the next call
+        shutdown_parse_pool()
+        raise
+
+
+def _chunksize(n_items: int, chunksize: int = None) -> int:
+    chunksize = chunksize or PARSE_CHUNKSIZE
+    if chunksize > 0:
+        return chunksize
+    return max(1, math.ceil(n_items / max(PARSE_WORKERS, 1)))
+
+
+def _apply_chunk(fn, chunk):
+    return [fn(*args) for args in chunk]
+
+
+def parse_map(fn, *iterables, chunksize: int = None) -> list:
+    """Blocking, chunked map of a picklable top-level function over the parse pool
+
+    Args:
+        fn: the function, called as fn(*items) for each set of items.
+        iterables: the argument lists, as for map().
+        chunksize (int, optional): items per IPC round trip, FC_PARSE_CHUNKSIZE by default.
+
+    Returns:
+        list: the results, in input order.
+    """
+    columns = [list(iterable) for iterable in iterables]
+    n_items = len(columns[0]) if columns else 0
+    pool = get_parse_pool()
+    if pool is None or n_items == 0:
+        return list(map(fn, *columns))
+    try:
+        return list(pool.map(fn, *columns, chunksize=_chunksize(n_items, chunksize)))
+    except BrokenProcessPool:
+        shutdown_parse_pool()
+        raise
+
+
+async def aparse_map(fn, *iterables, chunksize: int = None) -> list:
+    """Awaitable parse_map: every chunk is one task in the parse pool, awaited together"""
+    items = list(zip(*iterables))
+    size = _chunksize(len(items), chunksize)
+    chunks = [items[i : i + size] for i in range(0, len(items), size)]
+    results = await asyncio.gather(*(run_in_parse_pool(_apply_chunk, fn, chunk) for chunk in chunks))
+    return [result for chunk_results in results for result in chunk_results]
@@ -12,8 +12,8 @@ import plotly.graph_objects as go
 from fastapi.middleware.cors import CORSMiddleware
 from transformers import AutoModelForSequenceClassification, DebertaV2Tokenizer
 
-# Import functions from final.py
-from final import (
+# Import functions from final.py (run from backend_matrix: uvicorn nlp_model.api:app)
+from nlp_model.final import (
     load_knowledge_graph,
     predict_with_model,
     predict_with_knowledge_graph,
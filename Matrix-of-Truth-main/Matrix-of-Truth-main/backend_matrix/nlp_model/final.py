@@ -8,10 +8,13 @@ import json
 import os
 import dotenv
 import plotly.graph_objects as go
+from core import llm_registry
 
 # Load environment variables
 dotenv.load_dotenv()
 
+llm_registry.register_model("nlp_analysis", "models/gemini-2.5-flash")
+
 def load_models():
     """Load all required ML models"""
     try:
@@ -104,10 +107,8 @@ class KnowledgeGraphBuilder:
 
 
 def setup_gemini():
-    """Initialize Gemini model"""
-    genai.configure(api_key=os.getenv("GEMINI_API"))
-    model = genai.GenerativeModel('models/gemini-2.5-flash')
-    return model
+    """Return the shared Gemini model handle (built once by the LLM registry)"""
+    return llm_registry.get_model("nlp_analysis")
 
 def predict_with_model(text, tokenizer, model):
     """Make predictions using the ML model"""
@@ -136,9 +136,12 @@ import time
 from fastapi import APIRouter, UploadFile, File, HTTPException
 import google.generativeai as genai
 import os
+from core import llm_registry
 
 audio_router = APIRouter()
 
+llm_registry.register_model("audio_analysis", "gemini-2.0-flash")
+
 @audio_router.post("/analyze-audio")
 async def analyze_audio_endpoint(file: UploadFile = File(...)):
     # Check file extension
@@ -172,7 +175,7 @@ async def analyze_audio_endpoint(file: UploadFile = File(...)):
         if not api_key:
             raise HTTPException(status_code=500, detail="GEMINI_API_KEY not configured")
             
-        genai.configure(api_key=api_key)
+        llm_registry.configure(api_key)
         
         # Upload with correct MIME type
         audio = genai.upload_file(temp_file_path, mime_type=mime_type)
@@ -188,7 +191,7 @@ async def analyze_audio_endpoint(file: UploadFile = File(...)):
         if audio.state != 2:
             raise HTTPException(status_code=500, detail="Audio processing timed out")
         
-        model = genai.GenerativeModel('gemini-2.0-flash')
+        model = llm_registry.get_model("audio_analysis")
         
         # More specific and structured prompt
         prompt = """
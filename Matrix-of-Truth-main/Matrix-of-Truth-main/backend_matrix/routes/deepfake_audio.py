@@ -5,6 +5,7 @@ import xgboost as xgb
 import os
 from typing import Dict
 import tempfile
+from core.metrics import register_model_state
 
 deepfake_audio_router = APIRouter()
 
@@ -20,6 +21,7 @@ model_path = os.path.join(current_dir, "..", "deepfake audio", "audio_model.json
 # Load model with correct path
 model = xgb.XGBClassifier()
 model.load_model(model_path)
+register_model_state("deepfake_audio", lambda: True)
 
 
 def extract_features(y, sr, max_pad=128):
@@ -9,6 +9,7 @@ from PIL import Image
 from typing import Dict, Any
 import sys
 from deepfake_detection.detector import *
+from core.metrics import register_model_state
 # Add the parent directory to the path to import detector
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -17,6 +18,7 @@ deepfake_router = APIRouter()
 
 # Load the model at startup
 model = None
+register_model_state("deepfake_image", lambda: model is not None)
 
 def initialize_model_if_needed():
     global model
@@ -9,9 +9,12 @@ import io
 import os
 from typing import List, Optional
 from datetime import datetime
+from core import llm_registry
 
 image_router = APIRouter()
 
+llm_registry.register_model("image_analysis", "gemini-2.5-flash")
+
 @image_router.post("/analyze-image")
 async def analyze_image_endpoint(file: UploadFile = File(...)):
     try:
@@ -27,9 +30,7 @@ async def analyze_image_endpoint(file: UploadFile = File(...)):
         content = await file.read()
         image = PIL.Image.open(io.BytesIO(content))
         
-        # Configure Gemini
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
+        model = llm_registry.get_model("image_analysis")
         
         # Prepare prompt
         prompt = "Analyze the content in this image and detect if it contains misinformation or bias. First state if the content is real or fake. Then give a short summary regarding the content. Then Summarize key points."
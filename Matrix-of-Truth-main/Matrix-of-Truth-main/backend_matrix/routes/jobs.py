@@ -0,0 +1,51 @@
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, ValidationError
+
+from fc.jobs import QueueFull, check_webhook_url, job_manager
+
+jobs_router = APIRouter()
+
+
+class JobSubmission(BaseModel):
+    kind: str
+    payload: Dict[str, Any]
+    webhook_url: Optional[str] = None
+
+
+@jobs_router.post("/jobs", status_code=202)
+async def submit_job(submission: JobSubmission):
+    """Queue a fact-check job and return its id right away
+
+    kind is one of the registered job kinds ("fc-text", "fc-url",
+    "fc-selected-news") and payload the body the matching route takes. Poll
+    GET /jobs/{job_id}, or pass webhook_url (a public http(s) URL) to have the
+    finished job POSTed there.
+    """
+    try:
+        payload = job_manager.validate(submission.kind, submission.payload)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind {submission.kind!r}, expected one of {job_manager.kinds()}")
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    if submission.webhook_url is not None:
+        try:
+            await check_webhook_url(submission.webhook_url)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        job = await job_manager.submit(submission.kind, payload, webhook_url=submission.webhook_url)
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Too many fact-check jobs, try again later ({str(e)})",
+                            headers={"Retry-After": "30"})
+    return {"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}"}
+
+
+@jobs_router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_dict()
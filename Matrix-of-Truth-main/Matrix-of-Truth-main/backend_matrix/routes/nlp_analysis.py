@@ -27,6 +27,7 @@ from nlp_model.final import (
 )
 import time
 import random
+from core.metrics import register_model_state
 import networkx as nx
 import plotly.graph_objects as go
 
@@ -38,6 +39,8 @@ nlp = None
 tokenizer = None
 model = None
 knowledge_graph = None
+register_model_state("nlp_classifier", lambda: model is not None)
+register_model_state("knowledge_graph", lambda: knowledge_graph is not None)
 
 # Input model
 class NewsInput(BaseModel):
@@ -181,10 +184,10 @@ async def analyze_news(news_input: NewsInput):
     max_retries = 10
     retry_count = 0
     gemini_result = None
+    gemini_model = setup_gemini()
 
     while retry_count < max_retries:
         try:
-            gemini_model = setup_gemini()
             gemini_result = analyze_content_gemini(gemini_model, news_input.text)
             
             # Check if we got valid results
@@ -25,7 +25,7 @@ class TranscriptInput(BaseModel):
 async def create_user_broadcast(user_input: UserInput):
     fact_checker = fact_checker_instance
     
-    factcheck_result = fact_checker.generate_report(user_input.text)
+    factcheck_result = await fact_checker.agenerate_report(user_input.text, mode="adaptive")
     
     broadcast_data = {
         "title": user_input.title,
@@ -55,8 +55,8 @@ async def process_transcript(transcript_input: TranscriptInput):
     print("transcript")
     print(transcript_input)
     
-    # Generate fact check report for the transcript
-    factcheck_result = fact_checker.generate_report(transcript_input.transcript)
+    # Generate fact check report for the transcript (fast mode: transcripts arrive in a stream)
+    factcheck_result = await fact_checker.agenerate_report(transcript_input.transcript, mode="fast")
     
     # Create the broadcast data structure
     broadcast_data = {
@@ -1,9 +1,14 @@
 from .news_summ import get_news
+import asyncio
 from newsapi.newsapi_client import NewsApiClient
 from fastapi import APIRouter, HTTPException
 import os
 from dotenv import load_dotenv
 from factcheck_instance import fact_checker_instance
+from fc.cache import normalize_url
+from fc.jobs import job_manager
+from fc.singleflight import SingleFlight
+from core.metrics import observe_call
 
 from pydantic import BaseModel
 
@@ -23,12 +28,20 @@ load_dotenv()
 
 input_router = APIRouter()
 
+# Clients submitting the same URL at once share a single article download
+url_flight = SingleFlight("article_urls")
+
+async def fetch_news(url: str):
+    news, _ = await url_flight.do(normalize_url(url), lambda: asyncio.to_thread(get_news, url))
+    return news
+
 @input_router.post("/search-news")
 async def search_news(search_data: SearchQuery):
     try:
         newsapi = NewsApiClient(api_key=os.environ.get('NEWS_API_KEY'))
 
-        news = newsapi.get_top_headlines(q=search_data.query, country="IN", language='en', page=1, page_size=10)
+        with observe_call("newsapi", "search"):
+            news = newsapi.get_top_headlines(q=search_data.query, country="IN", language='en', page=1, page_size=10)
         
         if not news['articles']:
             return {
@@ -53,7 +66,7 @@ async def fact_check_selected_news(selection: NewsSelectionInput):
             raise HTTPException(status_code=400, detail="News URL cannot be empty")
             
         # Get the news content using the existing get_news function
-        news_result = get_news(selection.news_url)
+        news_result = await fetch_news(selection.news_url)
         
         if news_result.get('status') == 'error' or len(news_result.get("summary", "")) == 0:
             return {
@@ -67,7 +80,7 @@ async def fact_check_selected_news(selection: NewsSelectionInput):
             raise HTTPException(status_code=500, detail="Fact checker not initialized")
         
         # Generate the fact check report
-        fact_check_result = fact_checker.generate_report(news_result.get('summary', ''))
+        fact_check_result = await fact_checker.agenerate_report(news_result.get('summary', ''), mode="adaptive")
         
         if not fact_check_result:
             raise HTTPException(status_code=500, detail="Fact check failed to generate results")
@@ -82,7 +95,8 @@ async def fact_check_selected_news(selection: NewsSelectionInput):
                         "source_analysis": fact_check_result.get("source_credibility", [])
                     }
                 },
-                "sources": fact_check_result.get("sources", [])
+                "sources": fact_check_result.get("sources", []),
+                "cache_status": fact_check_result.get("cache_status")
             }
         }
     except HTTPException:
@@ -99,7 +113,7 @@ async def get_fc_url(input_data: UrlInput):
         if not input_data.url or not input_data.url.strip():
             raise HTTPException(status_code=400, detail="URL cannot be empty")
             
-        news_text = get_news(input_data.url)
+        news_text = await fetch_news(input_data.url)
       
         if news_text.get('status') == 'error':
             return {
@@ -112,7 +126,7 @@ async def get_fc_url(input_data: UrlInput):
             raise HTTPException(status_code=500, detail="Fact checker not initialized")
             
         # Run fact check - it will be run through transformation pipeline
-        fact_check_result1 = fact_checker.generate_report(news_text.get('text', ''))
+        fact_check_result1 = await fact_checker.agenerate_report(news_text.get('text', ''), mode="adaptive")
         
         if not fact_check_result1:
             raise HTTPException(status_code=500, detail="Fact check failed to generate results")
@@ -128,7 +142,8 @@ async def get_fc_url(input_data: UrlInput):
                         "source_analysis" : fact_check_result1.get("source_credibility", [])
                     }
                 },
-                "sources": fact_check_result1.get("sources", [])
+                "sources": fact_check_result1.get("sources", []),
+                "cache_status": fact_check_result1.get("cache_status")
             }
         }
     except HTTPException:
@@ -150,7 +165,8 @@ async def get_fc_text(input_data: TextInput):
             raise HTTPException(status_code=500, detail="Fact checker not initialized")
             
         # Run fact check - it will be run through transformation pipeline
-        fact_check_result1 = fact_checker.generate_report(input_data.text)
+        # Called by the browser extension, so it uses the fast (snippet-only) evidence mode
+        fact_check_result1 = await fact_checker.agenerate_report(input_data.text, mode="fast")
         
         if not fact_check_result1:
             raise HTTPException(status_code=500, detail="Fact check failed to generate results")
@@ -166,7 +182,8 @@ async def get_fc_text(input_data: TextInput):
                         "source_analysis" : fact_check_result1.get("source_credibility", [])
                     }
                 },
-                "sources": fact_check_result1.get("sources", [])
+                "sources": fact_check_result1.get("sources", []),
+                "cache_status": fact_check_result1.get("cache_status")
             }
         }
     except HTTPException:
@@ -175,4 +192,10 @@ async def get_fc_text(input_data: TextInput):
         import traceback
         error_detail = f"Error in fact checking: {str(e)}\n{traceback.format_exc()}"
         print(error_detail)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+# The same handlers back POST /jobs, for clients that poll or take a webhook instead of waiting;
+# the routes above keep awaiting the pipeline directly, outside the job workers' limits
+job_manager.register("fc-selected-news", fact_check_selected_news, NewsSelectionInput.model_validate)
+job_manager.register("fc-url", get_fc_url, UrlInput.model_validate)
+job_manager.register("fc-text", get_fc_text, TextInput.model_validate)
@@ -2,9 +2,12 @@ from fastapi import APIRouter, UploadFile, File, HTTPException
 import google.generativeai as genai
 import time
 import os
+from core import llm_registry
 
 video_router = APIRouter()
 
+llm_registry.register_model("video_analysis", "gemini-2.0-flash")
+
 @video_router.post("/analyze-video")
 async def analyze_video_endpoint(file: UploadFile = File(...)):
     try:
@@ -23,7 +26,7 @@ async def analyze_video_endpoint(file: UploadFile = File(...)):
                 content = await file.read()
                 buffer.write(content)
             
-            genai.configure(api_key=api_key)
+            llm_registry.configure(api_key)
             video = genai.upload_file(temp_file_path, mime_type="video/mp4")
             
             max_attempts = 30
@@ -37,7 +40,7 @@ async def analyze_video_endpoint(file: UploadFile = File(...)):
             if video.state != 2:
                 raise HTTPException(status_code=500, detail="Video processing timed out")
             
-            model = genai.GenerativeModel('gemini-2.0-flash')
+            model = llm_registry.get_model("video_analysis")
             prompt = "Analyze the speech in this video and detect if it contains misinformation or bias. First state if the content is real or fake. Then give a short summary regarding the speech. Then Summarize key points."
             response = model.generate_content([prompt, video])
             
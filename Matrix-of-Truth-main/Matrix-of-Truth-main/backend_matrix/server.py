@@ -0,0 +1,195 @@
+"""
+The backend FastAPI app: routers, lifespan (models, scheduler, job workers) and
+the health, metrics and trace endpoints. It is served through main.py.
+"""
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.middleware.cors import CORSMiddleware
+from routes.news_fetch import news_router
+from routes.user_inputs import input_router
+import asyncio
+from fc.newsfetcher import NewsFetcher
+from fc.scam_fetcher import ScamFetcher
+import os
+from contextlib import asynccontextmanager
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from routes.user_broadcast import router
+from routes.video_analysis import video_router
+from routes.image_analysis import image_router
+from routes.audio_analysis import audio_router
+from routes.deepfake_audio import deepfake_audio_router
+from routes import video_broadcast
+from routes.nlp_analysis import nlp_router
+from routes.deepfake_detection import deepfake_router
+from routes.scam_alerts import scam_router  
+from routes.jobs import jobs_router
+from fc.cache import cache_stats
+from fc.cassette import cassette
+from fc.crawler import crawler
+from fc.jobs import job_manager
+from fc.serper_batcher import batcher_stats
+from fc.tracing import recent_traces, stage_stats
+from fc.workers import shutdown_parse_pool
+from core import llm_registry, metrics
+
+news_fetcher = NewsFetcher()
+scam_fetcher = ScamFetcher()
+
+async def fetch_and_broadcast_news():
+    try:
+        # Awaited on the server loop: the shared async Gemini clients are bound to it
+        with metrics.observe_job("fetch_news"):
+            news_data = await news_fetcher.aprocess_single_news()
+        # Frontend listens to Firestore directly, no need to broadcast via Pusher
+            
+    except Exception as e:
+        print(f"Error in fetch_and_broadcast_news: {e}")
+
+async def fetch_scam_alerts():
+    try:
+        loop = asyncio.get_running_loop()
+        with metrics.observe_job("fetch_scam_alerts"):
+            scam_data = await loop.run_in_executor(None, scam_fetcher.process_single_scam)
+        # Frontend listens to Firestore directly, no need to broadcast via Pusher
+            
+    except Exception as e:
+        print(f"Error in fetch_and_broadcast_scam: {e}")
+
+scheduler = AsyncIOScheduler()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print("\n" + "="*60)
+    print("Starting Matrix of Truth Backend Server")
+    print("="*60)
+    
+    # Download models from Cloud Storage if needed
+    print("\nChecking model files...")
+    try:
+        from core.model_loader import ensure_models_available
+        ensure_models_available()
+    except Exception as e:
+        print(f"Warning: Could not download models: {e}")
+    
+    # Check critical environment variables
+    critical_vars = ['GROQ_API_KEY', 'SERPER_API_KEY', 'GEMINI_API_KEY', 'NEWS_API_KEY']
+    print("\nEnvironment Variables Check:")
+    for var in critical_vars:
+        status = "✓ SET" if os.environ.get(var) else "✗ NOT SET"
+        print(f"  {var}: {status}")
+    
+    print("\nBuilding shared Gemini model handles...")
+    try:
+        print(f"  Ready: {', '.join(llm_registry.warm())}")
+    except Exception as e:
+        print(f"Warning: Could not build Gemini models: {e}")
+    
+    print("\nInitializing news database...")
+    news_docs = news_fetcher.db_service.news_ref.limit(1).get()
+
+    if len(list(news_docs)) == 0:
+        print("No news in database. Fetching initial news...")
+        news_fetcher.fetch_initial_news()
+    else:
+        print("News database already initialized.")
+    
+    print("\nScheduling news fetching job...")
+    scheduler.add_job(fetch_and_broadcast_news, 'interval', seconds=300)
+    # await fetch_and_broadcast_news()
+    
+    print("Scheduling scam alerts fetching job (daily)...")
+    scheduler.add_job(fetch_scam_alerts, 'interval', seconds=6000)
+    # await fetch_scam_alerts()
+    
+    scheduler.start()
+    
+    print("Starting fact-check job workers...")
+    await job_manager.start()
+    
+    print("\n" + "="*60)
+    print("Server is ready! Listening on http://127.0.0.1:8000")
+    print("API Documentation: http://127.0.0.1:8000/docs")
+    print("="*60 + "\n")
+    
+    yield
+    
+    print("\nShutting down server...")
+    scheduler.shutdown()
+    await job_manager.stop()
+    await crawler.aclose()
+    shutdown_parse_pool()
+    cassette.close()
+    print("Server stopped.")
+
+app = FastAPI(lifespan=lifespan)
+
+# Configure CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router(news_router, tags=["News"])
+app.include_router(input_router, tags=["User Inputs"])
+app.include_router(router, tags=["User Broadcast"])
+app.include_router(video_router, tags=["Video Analysis"])
+app.include_router(image_router, tags=["Image Analysis"])
+app.include_router(audio_router, tags=["Audio Analysis"])
+app.include_router(deepfake_audio_router, tags=["Audio Detection"])
+app.include_router(video_broadcast.router)
+app.include_router(nlp_router, prefix="/nlp", tags=["NLP Analysis"])
+app.include_router(deepfake_router, prefix="/deepfake", tags=["Deepfake Detection"])
+app.include_router(scam_router, tags=["Scam Alerts"]) 
+app.include_router(jobs_router, tags=["Jobs"])
+
+# Request rate, latency and in-flight requests per router, served at /metrics
+metrics.label_routers({
+    "news_router": news_router,
+    "input_router": input_router,
+    "broadcast_router": router,
+    "video_router": video_router,
+    "image_router": image_router,
+    "audio_router": audio_router,
+    "deepfake_audio_router": deepfake_audio_router,
+    "video_broadcast_router": video_broadcast.router,
+    "nlp_router": nlp_router,
+    "deepfake_router": deepfake_router,
+    "scam_router": scam_router,
+    "jobs_router": jobs_router,
+})
+app.middleware("http")(metrics.metrics_middleware)
+metrics.register_collector(lambda: metrics.record_cache_stats(cache_stats()))
+
+@app.get("/")
+def read_root():
+    return {"message": "Welcome to the API"}
+
+@app.get("/health")
+def health_check():
+    return {
+        "status": "healthy",
+        "version": "1.0.0",
+        "caches": cache_stats(),
+        "crawler": crawler.stats(),
+        "serper_batches": batcher_stats(),
+        "cassette": cassette.stats(),
+        "jobs": job_manager.stats()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus text-format metrics"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/traces")
+def get_traces(limit: int = 10):
+    """Stage trace trees of the most recent generate_report runs, newest first"""
+    return {"traces": recent_traces(limit)}
+
+@app.get("/traces/stages")
+def get_stage_stats():
+    """p50/p95/p99 latency of every fact-check stage"""
+    return {"stages": stage_stats()}
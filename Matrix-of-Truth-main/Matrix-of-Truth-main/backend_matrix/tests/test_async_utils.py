@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from fc.async_utils import background_loop, run_sync
+
+
+async def _loop_of_call():
+    await asyncio.sleep(0)
+    return asyncio.get_running_loop()
+
+
+def test_repeated_calls_share_one_persistent_loop():
+    first = run_sync(_loop_of_call())
+    second = run_sync(_loop_of_call())
+
+    assert first is second is background_loop()
+    assert not first.is_closed()
+
+
+def test_exceptions_propagate():
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        run_sync(fail())
+
+
+def test_calling_from_a_running_loop_is_refused():
+    async def main():
+        with pytest.raises(RuntimeError):
+            run_sync(_loop_of_call())
+
+    asyncio.run(main())
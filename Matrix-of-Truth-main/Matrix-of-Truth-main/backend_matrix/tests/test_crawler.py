@@ -0,0 +1,88 @@
+import asyncio
+import gzip
+
+import httpx
+
+from fc import crawler as crawler_module
+from fc.crawler import Crawler
+
+
+def _crawler_serving(handler) -> Crawler:
+    crawler = Crawler()
+    crawler._build_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return crawler
+
+
+def _fetch(crawler: Crawler, url: str):
+    async def fetch():
+        try:
+            return await crawler.get(url)
+        finally:
+            await crawler.aclose()
+    return asyncio.run(fetch())
+
+
+def test_byte_cap_counts_decoded_body_of_compressed_page(monkeypatch):
+    monkeypatch.setattr(crawler_module, "CRAWL_MAX_BYTES", 64 * 1024)
+    # ~1 MiB of HTML that gzips to a few KiB, well under the cap on the wire
+    html = "<html><body>" + "<p>The same sentence, over and over.</p>" * 25000 + "</body></html>"
+    body = gzip.compress(html.encode("utf-8"))
+    assert len(body) < 64 * 1024
+
+    def handler(request):
+        return httpx.Response(
+            200, headers={"Content-Type": "text/html; charset=utf-8", "Content-Encoding": "gzip"}, content=body
+        )
+
+    crawler = _crawler_serving(handler)
+    document = _fetch(crawler, "http://example.com/page")
+
+    assert document is not None
+    assert document.truncated
+    assert len(document.text.encode("utf-8")) <= 64 * 1024
+    assert html.startswith(document.text)
+    assert crawler.truncated == 1
+
+
+def test_compressed_page_under_the_cap_is_read_whole(monkeypatch):
+    monkeypatch.setattr(crawler_module, "CRAWL_MAX_BYTES", 64 * 1024)
+    html = "<html><body><p>café naïve</p></body></html>"
+
+    def handler(request):
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "text/html; charset=utf-8", "Content-Encoding": "gzip"},
+            content=gzip.compress(html.encode("utf-8")),
+        )
+
+    document = _fetch(_crawler_serving(handler), "http://example.com/page")
+
+    assert document.text == html
+    assert not document.truncated
+
+
+def test_non_text_content_is_not_downloaded():
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Type": "application/pdf"}, content=b"%PDF-1.7")
+
+    crawler = _crawler_serving(handler)
+    assert _fetch(crawler, "http://example.com/file.pdf") is None
+    assert crawler.rejected_content_type == 1
+
+
+def test_client_is_closed_when_its_loop_shuts_down():
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, content=b"<p>page</p>")
+
+    crawler = _crawler_serving(handler)
+    clients = []
+
+    async def fetch():
+        clients.append(crawler.client())
+        return await crawler.get("http://example.com/page")
+
+    # No explicit aclose(): asyncio.run's shutdown closes the client
+    document = asyncio.run(fetch())
+
+    assert document.text == "<p>page</p>"
+    assert clients[0].is_closed
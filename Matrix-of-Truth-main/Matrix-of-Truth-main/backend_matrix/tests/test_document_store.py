@@ -0,0 +1,28 @@
+from fc.document_store import DocumentStore, FetchedDocument, document_size
+
+
+def _page(url: str, chars: int) -> FetchedDocument:
+    return FetchedDocument(url=url, status_code=200, content_type="text/html", text="x" * chars)
+
+
+def test_store_is_bounded_by_total_size_of_the_pages():
+    page = _page("http://example.com/0", 100_000)
+    store = DocumentStore(max_entries=256, max_bytes=3 * document_size(page))
+
+    for i in range(10):
+        store.put(f"http://example.com/{i}", _page(f"http://example.com/{i}", 100_000))
+
+    assert store.cache.memory.total_bytes <= 3 * document_size(page)
+    assert len(store.cache.memory) == 3
+    # Least recently stored pages are evicted first
+    assert store.get("http://example.com/0") is None
+    assert store.get("http://example.com/9") is not None
+
+
+def test_page_larger_than_the_whole_store_is_not_kept():
+    store = DocumentStore(max_bytes=1000)
+    store.put("http://example.com/small", _page("http://example.com/small", 10))
+    store.put("http://example.com/huge", _page("http://example.com/huge", 10_000))
+
+    assert store.get("http://example.com/huge") is None
+    assert store.get("http://example.com/small") is not None
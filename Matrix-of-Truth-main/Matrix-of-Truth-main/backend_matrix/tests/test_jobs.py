@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from fc.jobs import check_webhook_url
+
+
+@pytest.mark.parametrize("url", [
+    "ftp://93.184.216.34/hook",
+    "file:///etc/passwd",
+    "http:///no-host",
+    "http://127.0.0.1:8000/jobs",
+    "http://localhost/hook",
+    "http://10.0.0.5/hook",
+    "http://192.168.1.1/hook",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/hook",
+    "http://[::ffff:127.0.0.1]/hook",
+    "http://0.0.0.0/hook",
+])
+def test_webhook_url_to_internal_or_non_http_target_is_rejected(url):
+    with pytest.raises(ValueError):
+        asyncio.run(check_webhook_url(url))
+
+
+def test_webhook_url_to_public_address_is_accepted():
+    url = "https://93.184.216.34:8443/hooks/fact-check"
+    assert asyncio.run(check_webhook_url(url)) == url
@@ -0,0 +1,49 @@
+import os
+import shutil
+import subprocess
+import sys
+import textwrap
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stands in for the real app module: records every process that imports it
+FAKE_SERVER = """
+import os
+with open(os.environ["SERVER_IMPORTS"], "a") as f:
+    f.write(f"{os.getpid()}\\n")
+app = object()
+"""
+
+# Stands in for uvicorn.run: starts the parse pool the way a request would
+FAKE_UVICORN = """
+from fc.text_extract import visible_text
+from fc.workers import parse_map, shutdown_parse_pool
+
+
+def run(app, **kwargs):
+    pages = [f"<html><body><p>page {i}</p><script>x()</script></body></html>" for i in range(8)]
+    print(parse_map(visible_text, pages))
+    shutdown_parse_pool()
+"""
+
+
+def test_parse_pool_under_python_main_py_does_not_rebuild_the_app(tmp_path):
+    shutil.copy(os.path.join(BACKEND_DIR, "main.py"), tmp_path / "main.py")
+    (tmp_path / "server.py").write_text(textwrap.dedent(FAKE_SERVER))
+    (tmp_path / "uvicorn.py").write_text(textwrap.dedent(FAKE_UVICORN))
+    imports = tmp_path / "server_imports.txt"
+    env = {
+        **os.environ,
+        "PYTHONPATH": BACKEND_DIR,
+        "FC_PARSE_WORKERS": "2",
+        "SERVER_IMPORTS": str(imports),
+    }
+
+    result = subprocess.run(
+        [sys.executable, "main.py"], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "page 7" in result.stdout
+    # Imported by the server process only, never by the spawned parse workers
+    assert len(imports.read_text().split()) == 1
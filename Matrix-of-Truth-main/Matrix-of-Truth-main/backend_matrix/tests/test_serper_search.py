@@ -0,0 +1,90 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from fc import serper_search, workers
+from fc.document_store import FetchedDocument
+from fc.serper_search import SerperEvidenceRetriever
+
+PAGES = {
+    "http://a.example/1": "<html><body><p>Alpha snippet text here. More alpha context follows.</p></body></html>",
+    "http://b.example/2": "<html><body><p>Bravo snippet text here. More bravo context follows.</p>"
+                          "<p>Charlie snippet text here. More charlie context follows.</p></body></html>",
+}
+
+RESULTS = {
+    "query a": [
+        {"link": "http://a.example/1", "snippet": "Alpha snippet text here."},
+        {"link": "http://b.example/2", "snippet": "Bravo snippet text here."},
+    ],
+    # Returns a page query a returned too, with another snippet of it
+    "query b": [
+        {"link": "http://b.example/2", "snippet": "Charlie snippet text here."},
+        {"link": "http://c.example/3", "snippet": "Delta snippet, the page fails to crawl."},
+    ],
+}
+
+
+@pytest.fixture
+def retriever(monkeypatch):
+    # Parse in the default thread pool rather than spawning workers
+    monkeypatch.setattr(workers, "PARSE_WORKERS", 0)
+    retriever = SerperEvidenceRetriever(api_key="test")
+
+    async def search(query_list, top_k):
+        return [{"searchParameters": {"q": query}, "organic": RESULTS[query][:top_k]} for query in query_list]
+
+    crawled = []
+
+    async def crawl(urls):
+        crawled.extend(urls)
+        return [
+            FetchedDocument(url=url, status_code=200, content_type="text/html", text=PAGES[url]) if url in PAGES else None
+            for url in urls
+        ]
+
+    monkeypatch.setattr(retriever, "_asearch", search)
+    monkeypatch.setattr(serper_search, "acrawl_urls", crawl)
+    retriever.crawled = crawled
+    return retriever
+
+
+def _retrieve(retriever, query_list):
+    return asyncio.run(retriever._retrieve_evidence_4_all_claim(query_list, top_k=3))
+
+
+def test_evidence_is_grouped_by_query_and_each_url_is_crawled_once(retriever):
+    evidences = _retrieve(retriever, ["query a", "query b", "query a"])
+
+    assert sorted(retriever.crawled) == ["http://a.example/1", "http://b.example/2", "http://c.example/3"]
+    assert len(evidences) == 3
+
+    alpha, bravo = evidences[0]
+    assert alpha["url"] == "http://a.example/1" and alpha["extended"]
+    assert alpha["text"].startswith("Alpha snippet text here.") and "alpha context follows" in alpha["text"]
+    assert bravo["url"] == "http://b.example/2" and bravo["extended"]
+    assert bravo["text"].startswith("Bravo snippet text here.")
+
+    # The shared page is extended around each query's own snippet
+    charlie, delta = evidences[1]
+    assert charlie["url"] == "http://b.example/2" and charlie["extended"]
+    assert charlie["text"].startswith("Charlie snippet text here.")
+    assert delta == {"text": "Delta snippet, the page fails to crawl.", "url": "http://c.example/3", "extended": False}
+
+    # A repeated query gets the same evidence in a list of its own
+    assert evidences[2] == evidences[0]
+    assert evidences[2] is not evidences[0]
+
+
+def test_broken_parse_pool_keeps_the_serper_snippets(retriever, monkeypatch):
+    async def broken(responses, snippets, flags):
+        raise BrokenProcessPool("a parse worker died")
+
+    monkeypatch.setattr(serper_search, "aextend_snippets", broken)
+    evidences = _retrieve(retriever, ["query a", "query b"])
+
+    assert evidences == [
+        [{"text": result["snippet"], "url": result["link"], "extended": False} for result in RESULTS[query]]
+        for query in ["query a", "query b"]
+    ]
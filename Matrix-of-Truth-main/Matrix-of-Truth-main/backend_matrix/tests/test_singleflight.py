@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from fc.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_run():
+    flight = SingleFlight("test")
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert len(runs) == 1
+    assert [result for result, _ in results] == ["result"] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "followers": 4, "abandoned": 0}
+
+
+def test_exception_reaches_every_caller():
+    flight = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_flights_are_keyed_per_event_loop():
+    flight = SingleFlight("test")
+    runs = []
+
+    async def work():
+        runs.append(1)
+        return len(runs)
+
+    # Sequential loops never share a task, even for the same key
+    assert asyncio.run(flight.do("key", work)) == (1, False)
+    assert asyncio.run(flight.do("key", work)) == (2, False)
+
+
+def test_cancelling_one_waiter_leaves_the_run_to_the_others():
+    flight = SingleFlight("test")
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return "done"
+
+    async def main():
+        leader = asyncio.create_task(flight.do("key", work))
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == ("done", True)
+    assert cancelled == []
+    assert flight.stats()["abandoned"] == 0
+
+
+def test_run_is_cancelled_once_its_last_waiter_leaves():
+    flight = SingleFlight("test")
+    released = []
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            released.append(1)
+
+    async def main():
+        waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        # The abandoned run unwound before the last waiter returned, and a new call starts afresh
+        assert released == [1]
+        assert flight.stats()["in_flight"] == 0
+
+        async def fresh():
+            return "fresh"
+        return await flight.do("key", fresh)
+
+    assert asyncio.run(main()) == ("fresh", False)
+    assert flight.stats()["abandoned"] == 1
@@ -0,0 +1,63 @@
+import pytest
+
+from fc import text_extract
+from fc.text_extract import bs4_page_text, bs4_visible_text, lxml_page_text, lxml_visible_text
+
+pytestmark = pytest.mark.skipif(not text_extract.LXML_AVAILABLE, reason="lxml is not installed")
+
+MALFORMED_PAGES = [
+    # Pages libxml2 restructures, which must come out as bs4 has them
+    "plain text no tags",
+    "<style>x{}</style>after",
+    "<p>unclosed <b>bold<p>next",
+    "<!-- c -->top<p>p</p>",
+    "<html><body><p>a</p></body></html><p>after html</p>",
+    "<html><head><title>T</title></head><body>x</body></html>trailing",
+    "<html><head><style>p { color: red }</style>tail of style</head><body>x</body></html>",
+    "\n\n<html><body><p>a</p></body></html>",
+    "<!DOCTYPE html>\n<html lang='en'><head></head><body><h1>H</h1>\t<p>p</p></body></html>\n<!-- end -->\n",
+    "<?xml version='1.0'?>\n<html><body>a</body></html>",
+    # Malformed markup inside <html>
+    "<html><body><p>unclosed <b>bold<p>next</body></html>",
+    "<html><body><b><i>misnested</b> tags</i> here</body></html>",
+    "<html><body><p>stray</p></p></div>close tags</body></html>",
+    "<html>text before head<head><title>T</title></head><body>body</body></html>",
+    "<HTML><BODY><P>Upper case</P><SCRIPT>var a = '</div>';</SCRIPT>after</BODY></HTML>",
+    "<html><body><style>.a{}</style>after style<p>p</p></body></html>",
+    "<html><body>a &amp; b &lt;c&gt; &nbsp; d &copy;</body></html>",
+    "<html><body><pre>  keep\n   this  </pre>   \n   <textarea>  t  </textarea></body></html>",
+    "<html><body><table><tr><td>1<td>2<tr><td>3</table>after table</body></html>",
+    "<html><body>text after body</body>more text</html>",
+    "<html><body><!-- comment -->visible<!-- another --> text</body></html>",
+    "<html><body><a href='x>y'>quoted gt</a></body></html>",
+    "<html><head><meta charset='utf-8'><title>Title</title><script>x()</script></head>"
+    "<body><noscript>ns</noscript><template>tpl</template>b</body></html>",
+    "<html><body><ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp></ruby>字</body></html>",
+    "<html><body><div><div><div>deep</div></div>",
+    "<html>\n  <head>\n    <title>T</title>\n  </head>\n  <body>\n    <p>a</p>\n\n    <p>b</p>\n  </body>\n</html>\n",
+]
+
+
+@pytest.mark.parametrize("html", MALFORMED_PAGES)
+def test_lxml_page_text_matches_bs4(html):
+    assert lxml_page_text(html) == bs4_page_text(html)
+
+
+@pytest.mark.parametrize("html", MALFORMED_PAGES)
+def test_lxml_visible_text_matches_bs4(html):
+    assert lxml_visible_text(html) == bs4_visible_text(html)
+
+
+def test_empty_lxml_output_falls_back_to_bs4(monkeypatch):
+    html = "<html><body><p>" + "Some article text. " * 50 + "</p></body></html>"
+    monkeypatch.setattr(text_extract, "_lxml_strings", lambda *args, **kwargs: [])
+
+    assert lxml_page_text(html) == bs4_page_text(html)
+    assert lxml_visible_text(html) == bs4_visible_text(html)
+
+
+def test_much_shorter_lxml_output_falls_back_to_bs4(monkeypatch):
+    html = "<html><body>" + "<p>paragraph</p>" * 100 + "</body></html>"
+    monkeypatch.setattr(text_extract, "_lxml_strings", lambda *args, **kwargs: ["paragraph"])
+
+    assert lxml_visible_text(html) == bs4_visible_text(html)
@@ -24,6 +24,8 @@ app.add_middleware(
 )
 
 API_KEY = os.getenv("EXT_GEMINI_API")
+# Overridable so load tests can point the backend at a local fixture server
+GEMINI_BASE_URL = os.getenv("EXT_GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
 if not API_KEY:
     print("WARNING: EXT_GEMINI_API not found in environment variables")
 
@@ -51,7 +53,7 @@ async def call_gemini_raw(prompt: str, tools: list = None, response_schema: dict
     """
     Makes a direct REST API call to Gemini to bypass SDK version issues.
     """
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={API_KEY}"
+    url = f"{GEMINI_BASE_URL}/v1beta/models/gemini-2.0-flash:generateContent?key={API_KEY}"
     
     headers = {
         "Content-Type": "application/json"
@@ -126,7 +128,7 @@ async def perform_fact_check(content_text: str, context_info: str):
         search_tools = [{"google_search": {}}]
         
         # We need to capture the full response to check for grounding
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={API_KEY}"
+        url = f"{GEMINI_BASE_URL}/v1beta/models/gemini-2.0-flash:generateContent?key={API_KEY}"
         headers = {"Content-Type": "application/json"}
         payload = {
             "contents": [{"parts": [{"text": search_prompt}]}],